@@ -103,7 +103,7 @@ aligner_block = head_col(
     [
         header("Aligner"),
         dcc.Dropdown(
-            ["correlation", "function sum", "eucl"],
+            ["correlation", "function sum", "eucl", "dtw"],
             "correlation",
             id="method_dropdown",
             style={
@@ -1,25 +1,28 @@
 #!/usr/bin/env python
 from bayes_opt import BayesianOptimization
 from bayes_opt.event import Events
-import plotly.graph_objects as go
 import pyarrow as pa
 import pyarrow.parquet as pq
 from dash import Dash, State, callback, Output, Input, ctx, DiskcacheManager
 import diskcache
+import functools
 import json
 import dash_bootstrap_components as dbc
 
 import pandas as pd
 from state import (
     Alignment,
+    PlotView,
     ProgressLogger,
     Settings,
     ViewState,
     alignment_or_default,
     estimate_bounds,
     method_to_aligner,
+    visible_range,
 )
 import layout as layout
+from store import SeriesStore
 import base64
 
 import os
@@ -36,7 +39,7 @@ from timescale.processing.pipeline import (
     interpolate_factor,
     normalization,
 )
-from timescale.generator import generate
+from timescale.generator import synthetic
 import timescale.processing.alignment as tsalign
 import timescale.io as tio
 
@@ -47,6 +50,8 @@ REAL_OFFSET = FACTOR * OFFSET
 
 cache = diskcache.Cache("./cache")
 background_callback_manager = DiskcacheManager(cache)
+# The stores of the layout only hold keys of this store
+series = SeriesStore("./cache/series")
 
 app = Dash(name="timescale", external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.layout = layout.layout()
@@ -71,10 +76,10 @@ app.layout = layout.layout()
     cancel=Input("cancel_align_button", "n_clicks"),
     progress=[Output("progress_bar", "value"), Output("progress_bar", "max")],
 )
-def align(set_progress, clicks, ts1json, ts2json, settings):
+def align(set_progress, clicks, ts1key, ts2key, settings):
     del clicks
-    ts1 = tio.from_json(ts1json)
-    ts2 = tio.from_json(ts2json)
+    ts1 = series.get(ts1key)
+    ts2 = series.get(ts2key)
 
     settings = Settings(**json.loads(settings))
     total = settings.points + settings.iterations
@@ -85,10 +90,21 @@ def align(set_progress, clicks, ts1json, ts2json, settings):
         "scale": (lower_scale, upper_scale),
     }
     aligner_class = method_to_aligner(settings.align_method)
+    # The correlation aligner scores all translations of a scale at once,
+    # so only the scale has to be searched.
+    search_translation = aligner_class is not tsalign.CorrelationAligner
+    if search_translation:
+        f = tsalign.align(ts1, ts2, aligner_class)
+    else:
+        del pbounds["translation"]
+        aligner = tsalign.CorrelationAligner(ts1, ts2, tsalign.TransformCache())
+
+        def f(scale):
+            return aligner.best_alignment(scale)[1]
 
     logger = ProgressLogger(total, set_progress)
     optimizer = BayesianOptimization(
-        f=tsalign.align(ts1, ts2, aligner_class),
+        f=f,
         pbounds=pbounds,
     )
     optimizer.subscribe(Events.OPTIMIZATION_STEP, logger)
@@ -103,8 +119,12 @@ def align(set_progress, clicks, ts1json, ts2json, settings):
         return alignment_or_default(None)
     else:
         scale = best["scale"]
-        offset = int(best["translation"])
-        return json.dumps(Alignment(scale, offset).__dict__)
+        if search_translation:
+            translation = best["translation"]
+        else:
+            alignment, _ = aligner.best_alignment(scale)
+            translation = alignment.translation
+        return json.dumps(Alignment(scale, int(translation)).__dict__)
 
 
 @callback(
@@ -126,7 +146,7 @@ def ts_factory(i):
                 ts = default_ts1()
             else:
                 ts = default_ts2()
-            return tio.to_json(ts), "default dataset"
+            return series.put(ts), "default dataset"
         content = content.split(",")[1]
         decoded = base64.b64decode(content)
 
@@ -138,7 +158,7 @@ def ts_factory(i):
         pipeline.push(index_to_time)
         pipeline.push(normalization())
         ts = pipeline.apply(ts)
-        return tio.to_json(ts), f"file: {filename}"
+        return series.put(ts), f"file: {filename}"
 
     return register_upload
 
@@ -151,9 +171,8 @@ for i in range(1, 3):
         Input(f"info_upload{i}", "contents"),
     )(ts_factory(i))
 
-    def info_ts(ts_json):
-        ts = tio.from_json(ts_json)
-        return f"n: {len(ts.df)}"
+    def info_ts(ts_key):
+        return f"n: {len(series.get(ts_key))}"
 
     app.callback(Output(f"info_n{i}", "children"), Input(f"ts{i}store", "data"))(
         info_ts
@@ -178,6 +197,17 @@ def alignment_slider(alignment_data, scale, offset):
     return json.dumps(alignment.__dict__), alignment.scale, alignment.offset
 
 
+@functools.lru_cache(maxsize=4)
+def plot_view(ts1, ts2, alignment, align_method) -> PlotView:
+    # Everything that doesn't depend on the visible range is only computed once per input
+    ts1, ts2 = series.get(ts1), series.get(ts2)
+    state = ViewState(ts1, ts2, alignment_or_default(alignment))
+    ts1_trans, ts2_trans = state.transform()
+    aligner = method_to_aligner(align_method)
+    aligner = aligner(ts1_trans, ts2_trans)
+    return PlotView.build(ts1, ts2_trans, aligner)
+
+
 @callback(
     Output("align_score", "children"),
     Output("graph-content", "figure"),
@@ -185,36 +215,21 @@ def alignment_slider(alignment_data, scale, offset):
     Input("ts2store", "data"),
     Input("alignment", "data"),
     Input("settings", "data"),
+    Input("graph-content", "relayoutData"),
 )
-def update_graph(ts1, ts2, alignment, settings):
-    # deserialize from data storage
-    ts1, ts2 = tio.from_json(ts1), tio.from_json(ts2)
-    alignment = alignment_or_default(alignment)
+def update_graph(ts1, ts2, alignment, settings, relayout):
     settings = Settings(**json.loads(settings))
-    state = ViewState(ts1, ts2, alignment)
-
-    ts1_trans, ts2_trans = state.transform()
-    aligner = method_to_aligner(settings.align_method)
-    aligner = aligner(ts1_trans, ts2_trans)
-
-    # draw
-    fig = go.Figure()
-    fig.layout.__setattr__("uirevision", "const")
-
-    fig.add_scatter(
-        x=ts2_trans.time_column(),
-        y=ts2_trans.data_df().iloc[:, 0],
-        name="ts2",
-    )
+    view = plot_view(ts1, ts2, alignment, settings.align_method)
+    # Only the points of the visible range are sent, zooming slices the precomputed pyramids
+    start, end = visible_range(relayout)
+    fig = view.figure(start, end)
     # if 'uirevision' stays as it was before updating the figure, the zoom/ui will not reset. 'const' as value is arbitrary
-    fig.add_scatter(x=ts1.time_column(), y=ts1.data_df().iloc[:, 0], name="ts1")
-    aligner.add_visualization(fig)
-    score = aligner.alignment_score()
-    return f"{score}", fig
+    fig.layout.__setattr__("uirevision", "const")
+    return f"{view.score}", fig
 
 
 def default_ts1():
-    ts = generate.generate_simple_with_noise(n=2000, dimensions=1)
+    ts = synthetic.generate(n=2000, period=10.0, noise=0.2)
     pipeline = Pipeline()
     pipeline.push(interpolate_factor(factor=FACTOR)).push(index_to_time)
     ts = pipeline.apply(ts)
@@ -222,7 +237,7 @@ def default_ts1():
 
 
 def default_ts2():
-    ts2 = generate.generate_simple_with_noise(n=2000, dimensions=1)
+    ts2 = synthetic.generate(n=2000, period=10.0, noise=0.2)
     pipeline = Pipeline()
     pipeline.push(add(4))
     ts2 = pipeline.apply(ts2)
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 
 from bayes_opt import ScreenLogger
+import numpy as np
+import plotly.graph_objects as go
 from timescale.processing.pipeline import (
     Pipeline,
     interpolate_factor,
@@ -12,11 +14,16 @@ from timescale.processing.alignment import (
     SumAligner,
     CorrelationAligner,
     EuclidianAligner,
+    DTWAligner,
 )
 
+from timescale.processing.decimation import DecimationPyramid
 from timescale.timeseries import Timeseries
 import json
 
+# About the number of points per trace, which are sent to the browser
+MAX_POINTS = 2000
+
 
 @dataclass
 class Settings:
@@ -66,9 +73,7 @@ class ViewState:
             index_to_time
         )
         ts_trans2 = pipeline.apply(self.ts2)
-        ts_trans2.df[ts_trans2._time_column] = [
-            x + self.alignment.offset for x in ts_trans2.time_column()
-        ]
+        ts_trans2.set_time(ts_trans2.time_column().to_numpy() + self.alignment.offset)
         norm_pipeline = Pipeline().push(normalization(-1.0, 1.0))
         ts_trans2 = norm_pipeline.apply(ts_trans2)
         return ts_trans2
@@ -80,6 +85,58 @@ class ViewState:
         return ts1_normalized, ts_trans2
 
 
+@dataclass
+class PlotView:
+    """The traces of the graph as decimation pyramids, such that each visible range is served without recomputation."""
+
+    score: float
+    # (name, "scatter" or "bar", pyramid)
+    traces: List[Tuple[str, str, DecimationPyramid]]
+
+    @classmethod
+    def build(cls, ts1: Timeseries, ts2_trans: Timeseries, aligner) -> "PlotView":
+        traces = [
+            (name, "scatter", DecimationPyramid(ts.time_array(), ts.data_array()[:, 0]))
+            for name, ts in [("ts2", ts2_trans), ("ts1", ts1)]
+        ]
+        visualization = go.Figure()
+        aligner.add_visualization(visualization)
+        for trace in visualization.data:
+            pyramid = DecimationPyramid(np.asarray(trace.x), np.asarray(trace.y))
+            traces.append((trace.name, "bar", pyramid))
+        return cls(aligner.alignment_score(), traces)
+
+    def figure(self, start=None, end=None, max_points=MAX_POINTS) -> go.Figure:
+        fig = go.Figure()
+        for name, kind, pyramid in self.traces:
+            x, y = pyramid.query(
+                _as_time(start, pyramid), _as_time(end, pyramid), max_points
+            )
+            if kind == "bar":
+                fig.add_bar(x=x, y=y, name=name)
+            else:
+                fig.add_scatter(x=x, y=y, name=name)
+        return fig
+
+
+def _as_time(value, pyramid: DecimationPyramid):
+    # Plotly reports the range of a date axis as strings
+    if value is not None and np.issubdtype(pyramid.levels[0][0].dtype, np.datetime64):
+        return np.datetime64(str(value).replace(" ", "T"))
+    return value
+
+
+def visible_range(relayout) -> Tuple:
+    """The visible x range of the graph from its `relayoutData`, `(None, None)` for the whole range."""
+    if not relayout or relayout.get("xaxis.autorange"):
+        return None, None
+    if "xaxis.range[0]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"])
+    return None, None
+
+
 def method_to_aligner(method_name: str):
     method_name = method_name.lower()
     if method_name == "correlation":
@@ -88,6 +145,8 @@ def method_to_aligner(method_name: str):
         return SumAligner
     elif method_name == "eucl":
         return EuclidianAligner
+    elif method_name == "dtw":
+        return DTWAligner
     else:
         print(f"method name {method_name} couldn't be matched")
         return CorrelationAligner
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+import hashlib
+import threading
+
+import diskcache
+
+from timescale.timeseries import Timeseries
+import timescale.io as tio
+
+
+class SeriesStore:
+    """Keeps the series of the app on the server, the `dcc.Store`s only hold their keys.
+
+    The series are written as arrow IPC to a `diskcache.Cache`, such that the background callbacks,
+    which run in other processes, can read them. Their key is the SHA-256 of this payload,
+    so storing the same series twice returns the same key.
+    The most recently used series are additionally kept deserialized in memory,
+    which is guarded by a lock, since the threads of the server share the store.
+    The returned series are shared and must not be modified in place.
+
+    Parameters
+    ----------
+    directory
+        The directory of the disk cache.
+    size_limit
+        Upper bound of the bytes on disk, the least recently used series are evicted first.
+    memory_items
+        The number of deserialized series kept in memory.
+    """
+
+    def __init__(self, directory: str, size_limit=2**30, memory_items=8):
+        self._disk = diskcache.Cache(
+            directory,
+            size_limit=size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self._memory: OrderedDict = OrderedDict()
+        self._memory_items = memory_items
+        self._lock = threading.Lock()
+
+    def put(self, ts: Timeseries) -> str:
+        payload = tio.to_ipc(ts)
+        key = hashlib.sha256(payload).hexdigest()
+        if key not in self._disk:
+            self._disk.set(key, payload)
+        self._remember(key, ts)
+        return key
+
+    def get(self, key: str) -> Timeseries:
+        with self._lock:
+            ts = self._memory.get(key)
+            if ts is not None:
+                self._memory.move_to_end(key)
+                return ts
+        # Reading and deserializing happen outside of the lock
+        payload = self._disk.get(key)
+        if payload is None:
+            raise KeyError(
+                f"Series '{key}' is not stored (anymore), please upload it again."
+            )
+        ts = tio.from_ipc(payload)
+        self._remember(key, ts)
+        return ts
+
+    def _remember(self, key: str, ts: Timeseries):
+        with self._lock:
+            self._memory[key] = ts
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_items:
+                self._memory.popitem(last=False)
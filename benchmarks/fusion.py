@@ -0,0 +1,95 @@
+"""
+Compares the fused execution of element-wise stages with the column by column pandas implementation
+of the same stages, which is what each stage did before fusion, and with calling the stages one after another.
+
+    python -m benchmarks.fusion
+"""
+
+import copy
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from timescale.timeseries import Timeseries
+from timescale.processing.pipeline import Pipeline, add, mult, normalization
+
+
+def sample_ts(n, channels):
+    data = {"time": np.arange(n)}
+    rng = np.random.default_rng(0)
+    for c in range(channels):
+        data[f"value-{c}"] = rng.standard_normal(n)
+    return Timeseries(pd.DataFrame(data))
+
+
+def stages():
+    return [add(1.0), mult(2.0), normalization(-1.0, 1.0), add(0.5), mult(3.0)]
+
+
+def pandas_add(x):
+    def adder(ts):
+        for c in ts.data_columns():
+            ts.df[c] = ts.df[c] + x
+        return ts
+
+    return adder
+
+
+def pandas_mult(x):
+    def multiplier(ts):
+        for c in ts.data_columns():
+            ts.df[c] = ts.df[c] * x
+        return ts
+
+    return multiplier
+
+
+def pandas_normalization(min, max):
+    def normalize(ts):
+        for c in ts.data_columns():
+            x = ts.df[c]
+            ts.df[c] = ((x - np.min(x)) / (np.max(x) - np.min(x))) * (max - min) + min
+        return ts
+
+    return normalize
+
+
+def pandas_stages():
+    # The reference implementation of `stages`: one pandas operation per column and stage
+    return [
+        pandas_add(1.0),
+        pandas_mult(2.0),
+        pandas_normalization(-1.0, 1.0),
+        pandas_add(0.5),
+        pandas_mult(3.0),
+    ]
+
+
+def run(ts, fs):
+    ts = copy.deepcopy(ts)
+    for f in fs:
+        ts = f(ts)
+    return ts
+
+
+def fused(ts):
+    return Pipeline().push_batch(stages()).apply(ts)
+
+
+if __name__ == "__main__":
+    for n, channels in [(10_000, 4), (1_000_000, 4), (1_000_000, 16)]:
+        ts = sample_ts(n, channels)
+        expected = run(ts, pandas_stages()).df
+        assert np.allclose(run(ts, stages()).df, expected)
+        assert np.allclose(fused(ts).df, expected)
+        t_pandas = min(
+            timeit.repeat(lambda: run(ts, pandas_stages()), number=1, repeat=5)
+        )
+        t_stage = min(timeit.repeat(lambda: run(ts, stages()), number=1, repeat=5))
+        t_fused = min(timeit.repeat(lambda: fused(ts), number=1, repeat=5))
+        print(
+            f"n={n:>9} channels={channels:>3}  pandas per stage: {t_pandas * 1e3:8.2f} ms"
+            f"  per stage: {t_stage * 1e3:8.2f} ms  fused: {t_fused * 1e3:8.2f} ms"
+            f"  speedup: {t_pandas / t_fused:5.2f}x"
+        )
@@ -0,0 +1,57 @@
+"""
+Compares the rolling window statistics of `timescale.processing.rolling` with pandas rolling, one column at a time.
+
+    python -m benchmarks.rolling
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import timescale.processing.rolling as rolling
+
+STATISTICS = {
+    "min": (rolling.window_min, lambda r: r.min()),
+    "max": (rolling.window_max, lambda r: r.max()),
+    "mean": (rolling.window_mean, lambda r: r.mean()),
+    "std": (rolling.window_std, lambda r: r.std()),
+    "median": (rolling.window_median, lambda r: r.median()),
+}
+
+
+def per_column(df, window, statistic):
+    return pd.concat(
+        [statistic(df[c].rolling(window)) for c in df.columns], axis=1
+    ).to_numpy()
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for n, channels in [(100_000, 4), (1_000_000, 4), (1_000_000, 16)]:
+        data = np.asfortranarray(np.cumsum(rng.standard_normal((n, channels)), axis=0))
+        df = pd.DataFrame(data)
+        for window in [10, 1000]:
+            for name, (engine, statistic) in STATISTICS.items():
+                assert np.allclose(
+                    engine(data, window),
+                    per_column(df, window, statistic),
+                    equal_nan=True,
+                    atol=1e-6,
+                )
+                repeat = 3
+                t_engine = min(
+                    timeit.repeat(lambda: engine(data, window), number=1, repeat=repeat)
+                )
+                t_pandas = min(
+                    timeit.repeat(
+                        lambda: per_column(df, window, statistic),
+                        number=1,
+                        repeat=repeat,
+                    )
+                )
+                print(
+                    f"n={n:>8} channels={channels:>3} window={window:>5} {name:<7}"
+                    f"  engine: {t_engine * 1e3:9.2f} ms  pandas: {t_pandas * 1e3:9.2f} ms"
+                    f"  speedup: {t_pandas / t_engine:6.2f}x"
+                )
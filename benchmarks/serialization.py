@@ -0,0 +1,46 @@
+"""
+Compares the round trip of the JSON serialization with the arrow IPC serialization in `timescale.io`.
+
+    python -m benchmarks.serialization
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import timescale.io as tio
+from timescale.timeseries import Timeseries
+
+
+def sample_ts(n, channels):
+    data = {"time": np.arange(n)}
+    rng = np.random.default_rng(0)
+    for c in range(channels):
+        data[f"value-{c}"] = rng.standard_normal(n)
+    return Timeseries(pd.DataFrame(data))
+
+
+FORMATS = {
+    "json": (tio.to_json, tio.from_json),
+    "ipc": (tio.to_ipc, tio.from_ipc),
+    "base64": (tio.to_base64, tio.from_base64),
+}
+
+
+if __name__ == "__main__":
+    for n, channels in [(6_000, 1), (100_000, 4), (1_000_000, 4)]:
+        ts = sample_ts(n, channels)
+        for name, (serialize, deserialize) in FORMATS.items():
+            payload = serialize(ts)
+            assert np.allclose(deserialize(payload).df, ts.df)
+            repeat = 1 if n > 100_000 and name == "json" else 5
+            t = min(
+                timeit.repeat(
+                    lambda: deserialize(serialize(ts)), number=1, repeat=repeat
+                )
+            )
+            print(
+                f"n={n:>9} channels={channels}  {name:>6}: {t * 1e3:9.2f} ms"
+                f"  {len(payload) / 1e6:8.3f} MB"
+            )
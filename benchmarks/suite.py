@@ -0,0 +1,291 @@
+"""
+Benchmark suite of the pipeline stages, the aligners, the alignment loop of the app and the I/O round trips
+on synthetic series of several sizes and channel counts.
+The results are written as JSON, which can be compared with a previous run.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --sizes 1000 100000 --channels 1 --filter stage/ --compare results.json
+"""
+
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+import pyarrow
+
+import timescale.io as tio
+import timescale.processing.alignment as talign
+from timescale.generator.synthetic import generate
+from timescale.processing.noise import gaussian_noise
+from timescale.processing.pipeline import (
+    Pipeline,
+    add,
+    cut_front,
+    index_to_time,
+    interpolate_count,
+    interpolate_factor,
+    mult,
+    normalization,
+    smoothing_basic,
+    smoothing_exponential,
+)
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+CHANNELS = [1, 4]
+
+STAGES = {
+    "interpolate_count": lambda n: interpolate_count(n // 2),
+    "interpolate_factor": lambda n: interpolate_factor(1.5),
+    "index_to_time": lambda n: index_to_time,
+    "cut_front": lambda n: cut_front(n // 10),
+    "mult": lambda n: mult(2.0),
+    "add": lambda n: add(1.0),
+    "normalization": lambda n: normalization(-1.0, 1.0),
+    "smoothing_basic": lambda n: smoothing_basic(10),
+    "smoothing_exponential": lambda n: smoothing_exponential(),
+    "gaussian_noise": lambda n: gaussian_noise(0.1, seed=0),
+}
+
+ALIGNERS = {
+    "eucl": (talign.EuclidianAligner, 10**7),
+    "sum": (talign.SumAligner, 10**7),
+    "correlation": (talign.CorrelationAligner, 10**7),
+    # The banded DTW loops over the rows in Python
+    "dtw": (talign.DTWAligner, 10**5),
+}
+
+
+def sample_pair(n, channels):
+    # ts2 is a noisy, shifted excerpt of ts1 with 3/4 of its length
+    ts1 = generate(n, channels, period=n / 20, noise=0.1, seed=0)
+    ts2 = generate(n, channels, period=n / 20, phase=1.0, noise=0.1, seed=1)
+    ts2 = Pipeline().push(cut_front(n // 4)).apply(ts2, copy_on_write=True)
+    return ts1, ts2
+
+
+# The cases are `(name, factory)` pairs. A factory prepares the inputs of its case and returns the function to measure,
+# it is only called if the case is selected. Inputs shared by several cases are built once by a cached function.
+
+
+def stage_cases(n, channels):
+    series = functools.cache(lambda: generate(n, channels, noise=0.1, seed=0))
+    for name, stage in STAGES.items():
+
+        def factory(stage=stage):
+            pipeline, ts = Pipeline().push(stage(n)), series()
+            return lambda: pipeline.apply(ts, copy_on_write=True)
+
+        yield f"stage/{name}", factory
+
+
+def aligner_cases(n, channels):
+    pair = functools.cache(lambda: sample_pair(n, channels))
+    for name, (aligner_class, max_n) in ALIGNERS.items():
+        if n > max_n:
+            continue
+
+        def factory(aligner_class=aligner_class):
+            aligner = aligner_class(*pair())
+            aligner.transform(talign.Alignment(1.1, n / 10))
+            return aligner.alignment_score
+
+        yield f"aligner/{name}", factory
+
+    def best_alignment():
+        aligner = talign.CorrelationAligner(*pair())
+        return lambda: aligner.best_alignment(1.1)
+
+    yield "aligner/correlation_best_alignment", best_alignment
+
+
+def app_alignment_loop(payload1, payload2, aligner_class, points=5, iterations=10):
+    """The alignment search of the app without Dash: both series arrive serialized,
+    `points + iterations` evaluations of the objective are made within the bounds estimated by the app.
+    Uses `bayes_opt` like the app if it is installed, a seeded random search otherwise.
+    """
+    ts1, ts2 = tio.from_base64(payload1), tio.from_base64(payload2)
+    # See `estimate_bounds` in app/state.py
+    lower_scale, upper_scale = len(ts1) / len(ts2) / 1.6, len(ts1) / len(ts2) * 1.6
+    pbounds = {
+        "translation": (-lower_scale * len(ts2) * 0.1, len(ts1) * 0.9),
+        "scale": (lower_scale, upper_scale),
+    }
+    if aligner_class is talign.CorrelationAligner:
+        del pbounds["translation"]
+        aligner = talign.CorrelationAligner(ts1, ts2, talign.TransformCache())
+
+        def f(scale):
+            return aligner.best_alignment(scale)[1]
+
+    else:
+        f = talign.align(ts1, ts2, aligner_class)
+    try:
+        from bayes_opt import BayesianOptimization
+    except ImportError:
+        rng = np.random.default_rng(0)
+        for _ in range(points + iterations):
+            f(**{k: rng.uniform(*bounds) for k, bounds in pbounds.items()})
+        return
+    optimizer = BayesianOptimization(f=f, pbounds=pbounds, verbose=0, random_state=0)
+    optimizer.maximize(init_points=points, n_iter=iterations)
+
+
+def app_cases(n, channels):
+    if n > 10**6:
+        return
+
+    @functools.cache
+    def payloads():
+        ts1, ts2 = sample_pair(n, channels)
+        return tio.to_base64(ts1), tio.to_base64(ts2)
+
+    for name, (aligner_class, max_n) in ALIGNERS.items():
+        # The loop evaluates the aligner 15 times
+        if n > max_n // 10:
+            continue
+
+        def factory(aligner_class=aligner_class):
+            payload1, payload2 = payloads()
+            return lambda: app_alignment_loop(payload1, payload2, aligner_class)
+
+        yield f"app/align_{name}", factory
+
+
+def io_cases(n, channels, directory):
+    series = functools.cache(lambda: generate(n, channels, noise=0.1, seed=0))
+    path = os.path.join(directory, f"{n}_{channels}.parquet")
+
+    def parquet_roundtrip():
+        ts = series()
+
+        def roundtrip():
+            tio.write_as_parquet(ts, path)
+            return tio.read_from_parquet_file(path, time_column="timestamp")
+
+        return roundtrip
+
+    def ipc_roundtrip():
+        ts = series()
+        return lambda: tio.from_ipc(tio.to_ipc(ts))
+
+    def base64_roundtrip():
+        ts = series()
+        return lambda: tio.from_base64(tio.to_base64(ts))
+
+    def json_roundtrip():
+        ts = series()
+        return lambda: tio.from_json(tio.to_json(ts))
+
+    yield "io/parquet", parquet_roundtrip
+    yield "io/ipc", ipc_roundtrip
+    yield "io/base64", base64_roundtrip
+    # The JSON round trip is too slow for the largest series
+    if n <= 10**6:
+        yield "io/json", json_roundtrip
+
+
+def measure(f, repeat, budget):
+    # Runs `f` up to `repeat` times, but stops early once `budget` seconds are spent
+    times = []
+    while len(times) < repeat and sum(times) < budget:
+        times.extend(timeit.repeat(f, number=1, repeat=1))
+    return times
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(sizes, channel_counts, pattern, repeat, budget):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            for channels in channel_counts:
+                cases = [
+                    *stage_cases(n, channels),
+                    *aligner_cases(n, channels),
+                    *app_cases(n, channels),
+                    *io_cases(n, channels, directory),
+                ]
+                for name, factory in cases:
+                    if pattern and pattern not in name:
+                        continue
+                    times = measure(factory(), repeat, budget)
+                    result = {
+                        "case": name,
+                        "n": n,
+                        "channels": channels,
+                        "runs": len(times),
+                        "min_s": min(times),
+                        "median_s": float(np.median(times)),
+                    }
+                    results.append(result)
+                    print(
+                        f"{name:<40} n={n:>9} channels={channels:>2}"
+                        f"  min: {result['min_s'] * 1e3:10.2f} ms  runs: {len(times)}",
+                        flush=True,
+                    )
+    return results
+
+
+def compare(results, baseline):
+    # Prints the ratio of the minimal times of the cases, which are part of both runs
+    previous = {(r["case"], r["n"], r["channels"]): r for r in baseline["results"]}
+    print("\ncompared to the baseline (> 1 is slower):")
+    for r in results:
+        old = previous.get((r["case"], r["n"], r["channels"]))
+        if old is not None:
+            print(
+                f"{r['case']:<40} n={r['n']:>9} channels={r['channels']:>2}"
+                f"  {r['min_s'] / old['min_s']:6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--channels", type=int, nargs="+", default=CHANNELS)
+    parser.add_argument(
+        "--filter", default="", help="only run cases containing this text"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget", type=float, default=10.0, help="seconds per case and size"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.channels, args.filter, args.repeat, args.budget)
+    report = {"metadata": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
@@ -37,3 +37,195 @@ def test_translate():
     talign.translate(ts, 0.1)
     assert all(ts.time_column() == default.time_column())
     assert all(np.abs(ts.df["a"] - [2.9, 2.2, 4.0]) < 0.001)
+
+
+def test_translation_scores():
+    n = 200
+    x = np.sin(np.arange(n) / 7.0) + np.cos(np.arange(n) / 3.0)
+    ts1 = Timeseries(pd.DataFrame(data={"time": np.arange(n), "a": x}))
+    ts2 = Timeseries(pd.DataFrame(data={"time": np.arange(n - 30), "a": x[30:]}))
+    aligner = talign.CorrelationAligner(ts1, ts2)
+    translations, scores = aligner.translation_scores(1.0)
+    assert translations[0] == -(n - 31) and translations[-1] == n - 1
+    score = talign.align(ts1, ts2, talign.CorrelationAligner)
+    for t in [-50, 0, 17, 30, 150]:
+        assert np.isclose(scores[translations == t][0], score(float(t), 1.0))
+    alignment, _ = aligner.best_alignment(1.0)
+    assert abs(alignment.translation - 30) < 0.5
+
+
+def test_join_sorted():
+    ts1 = sample_ts()
+    df = pd.DataFrame(data={"ticks": [0, 3, 4, 5], "c": [1.0, 2.0, 3.0, 4.0]})
+    ts2 = Timeseries(df, time_column="ticks")
+    time, data1, data2 = talign.join_sorted(ts1, ts2)
+    assert all(time == [3, 5])
+    assert np.array_equal(data1, [[2.0, 4.0], [4.0, 9.0]])
+    assert np.array_equal(data2, [[2.0], [4.0]])
+
+
+def test_scores():
+    ts1 = sample_ts()
+    df = pd.DataFrame(data={"ticks": [0, 3, 4, 5], "c": [1.0, 2.0, 3.0, 4.0]})
+    ts2 = Timeseries(df, time_column="ticks")
+    for aligner in [talign.SumAligner, talign.CorrelationAligner]:
+        aligner = aligner(ts1, ts2)
+        assert aligner.alignment_score() == np.sum(aligner.apply()["result"])
+    assert talign.CorrelationAligner(ts1, ts2).alignment_score() == 16.0 + 144.0
+    assert talign.SumAligner(ts1, ts2).alignment_score() == 8.0 + 17.0
+
+
+def test_score_batch():
+    n = 100
+    x = np.sin(np.arange(n) / 7.0)
+    ts1 = Timeseries(pd.DataFrame(data={"time": np.arange(n), "a": x}))
+    ts2 = Timeseries(pd.DataFrame(data={"time": np.arange(n - 10), "a": x[10:]}))
+    candidates = np.array(
+        [[0.0, 1.0], [10.0, 1.0], [3.5, 1.0], [-2.0, 1.2], [5.0, 0.7]]
+    )
+    for aligner in [
+        talign.EuclidianAligner,
+        talign.SumAligner,
+        talign.CorrelationAligner,
+    ]:
+        scores = talign.align_batch(ts1, ts2, aligner)(candidates)
+        score = talign.align(ts1, ts2, aligner)
+        assert np.allclose(scores, [score(t, s) for t, s in candidates])
+
+
+def test_transform_cache():
+    n = 100
+    x = np.sin(np.arange(n) / 7.0)
+    ts1 = Timeseries(pd.DataFrame(data={"time": np.arange(n), "a": x}))
+    ts2 = Timeseries(pd.DataFrame(data={"time": np.arange(n - 10), "a": x[10:]}))
+    score = talign.align(ts1, ts2, talign.CorrelationAligner)
+    uncached = talign.CorrelationAligner(ts1, ts2)
+    uncached.transform(talign.Alignment(1.00001, 4.0))
+    assert score(4.0, 1.00001) == uncached.alignment_score()
+    # normalized ts1, scaled ts2 and normalized ts2
+    assert score.cache.misses == 3 and score.cache.hits == 0
+    score(7.0, 1.0)
+    assert score.cache.misses == 3 and score.cache.hits == 2
+    score(7.5, 1.0)
+    assert score.cache.misses == 3 and score.cache.hits == 4
+
+    cache = talign.TransformCache(max_bytes=n * 8 * 2)
+    score = talign.align(ts1, ts2, talign.CorrelationAligner, cache)
+    score(1.0, 1.0)
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_pyramid_align():
+    from timescale.processing.pyramid import pyramid_align
+
+    rng = np.random.default_rng(3)
+    n = 4000
+    walk = pd.Series(np.cumsum(rng.normal(size=n))).rolling(50, min_periods=1).mean()
+    ts1 = Timeseries(pd.DataFrame(data={"time": np.arange(n), "a": walk}))
+    ts2 = Timeseries(
+        pd.DataFrame(data={"time": np.arange(2000), "a": walk[1000:3000].to_numpy()})
+    )
+    alignment, score = pyramid_align(
+        ts1, ts2, talign.CorrelationAligner, (0.9, 1.1), levels=3
+    )
+    aligner = talign.CorrelationAligner(ts1, ts2)
+    best_score = max(
+        aligner.best_alignment(scale)[1] for scale in np.arange(0.9, 1.1, 0.001)
+    )
+    assert score >= best_score * 0.999
+    assert np.isclose(
+        score,
+        talign.align(ts1, ts2, talign.CorrelationAligner)(
+            alignment.translation, alignment.scale
+        ),
+    )
+
+
+def test_pyramid_align_noisy():
+    from timescale.processing.pyramid import build_pyramid, pyramid_align
+
+    rng = np.random.default_rng(0)
+    n = 8000
+    walk = pd.Series(np.cumsum(rng.normal(size=n))).rolling(50, min_periods=1).mean()
+    noisy = walk.to_numpy() + rng.normal(size=n) * 3 * walk.std()
+    ts1 = Timeseries(pd.DataFrame(data={"time": np.arange(n), "a": noisy}))
+    ts2 = Timeseries(
+        pd.DataFrame(data={"time": np.arange(4000), "a": noisy[2000:6000]})
+    )
+    # The coarse levels are block means
+    coarse = build_pyramid(ts1, 2)[1]
+    assert len(coarse) == n // 4
+    assert np.isclose(coarse.data_array()[1:-1, 0].std(), noisy.std() / 2, rtol=0.2)
+    _, best_score = talign.CorrelationAligner(ts1, ts2).best_alignment(1.0)
+    for levels in (1, 2, 4):
+        alignment, score = pyramid_align(
+            ts1, ts2, talign.CorrelationAligner, (0.9, 1.1), levels=levels
+        )
+        assert alignment.translation == 2000
+        assert int(4000 * alignment.scale) == 4000
+        assert score >= best_score * 0.999
+
+
+def test_score_parallel():
+    from timescale.processing.parallel import ParallelScorer
+
+    ts1 = sample_ts()
+    ts2 = sample_ts()
+    candidates = [[0, 1.0], [1, 1.0], [-1, 2.0], [0.5, 1.5]]
+    expected = talign.CorrelationAligner.score_batch(ts1, ts2, candidates)
+    with ParallelScorer(ts1, ts2, talign.CorrelationAligner, processes=2) as scorer:
+        assert np.allclose(scorer(candidates), expected)
+        assert np.allclose(scorer(candidates[::-1]), expected[::-1])
+
+
+def test_dtw():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(30, 2))
+    y = rng.normal(size=(25, 2))
+    lo, hi = talign.sakoe_chiba_window(np.arange(30), np.arange(25), 4)
+    cost, path = talign.banded_dtw(x, y, lo, hi, with_path=True)
+    assert np.isclose(cost, np.sum(np.abs(x[path[:, 0]] - y[path[:, 1]])))
+    assert np.all(np.diff(path, axis=0) >= 0)
+    assert np.all(np.abs(path[:, 0] - path[:, 1]) <= 5)
+
+    # Without warping the score is the one of the euclidian aligner
+    score = talign.align(sample_ts(), sample_ts(), talign.EuclidianAligner)(1, 1.0)
+    dtw = talign.DTWAligner(sample_ts(), sample_ts(), band=0)
+    dtw.transform(talign.Alignment(1.0, 1))
+    assert np.isclose(dtw.alignment_score(), score)
+
+    # Warping can only improve the score
+    dtw = talign.DTWAligner(sample_ts(), sample_ts(), band=2)
+    dtw.transform(talign.Alignment(1.0, 1))
+    assert dtw.alignment_score() >= score
+
+
+def test_aligner_kwargs():
+    from timescale.processing.parallel import score_parallel
+
+    rng = np.random.default_rng(2)
+    ts1 = Timeseries(
+        pd.DataFrame(data={"time": np.arange(50), "a": rng.normal(size=50)})
+    )
+    ts2 = Timeseries(
+        pd.DataFrame(data={"time": np.arange(40), "a": rng.normal(size=40)})
+    )
+    candidates = [[0, 1.0], [3, 1.0], [5, 0.9]]
+    expected = []
+    for translation, scale in candidates:
+        dtw = talign.DTWAligner(ts1, ts2, band=0)
+        dtw.transform(talign.Alignment(scale, translation))
+        expected.append(dtw.alignment_score())
+    kwargs = {"band": 0}
+    scores = talign.DTWAligner.score_batch(ts1, ts2, candidates, aligner_kwargs=kwargs)
+    assert np.allclose(scores, expected)
+    f = talign.align(ts1, ts2, talign.DTWAligner, aligner_kwargs=kwargs)
+    assert np.allclose([f(*c) for c in candidates], expected)
+    scores = score_parallel(
+        ts1, ts2, talign.DTWAligner, candidates, processes=2, aligner_kwargs=kwargs
+    )
+    assert np.allclose(scores, expected)
+    # The default band warps, so the scores differ
+    assert not np.allclose(
+        talign.DTWAligner.score_batch(ts1, ts2, candidates), expected
+    )
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from timescale.timeseries import Timeseries
+from timescale.processing.pipeline import *
+import timescale.io as tio
+
+
+def sample_ts(n=1000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        data={"ticks": np.arange(n) * 2, "a": rng.random(n), "b": rng.random(n)}
+    )
+    return Timeseries(df, time_column="ticks")
+
+
+def test_parquet_roundtrip(tmp_path):
+    ts = sample_ts()
+    tio.write_as_parquet(ts, tmp_path / "ts.parquet")
+    ts2 = tio.read_from_parquet_file(tmp_path / "ts.parquet")
+    assert ts2._time_column == "ticks"
+    assert ts.df.equals(ts2.df)
+
+
+def test_stream_parquet(tmp_path):
+    ts = sample_ts()
+    tio.write_as_parquet(ts, tmp_path / "ts.parquet", row_group_size=97)
+    chunks = list(tio.iter_parquet_row_groups(tmp_path / "ts.parquet"))
+    assert len(chunks) == 11
+    assert chunks[1].df.index[0] == 97
+
+    pipeline = Pipeline()
+    pipeline.push_batch(
+        [smoothing_basic(5), add(2.0), smoothing_exponential(), index_to_time]
+    )
+    pipeline.apply_parquet(tmp_path / "ts.parquet", tmp_path / "out.parquet")
+    streamed = tio.read_from_parquet_file(tmp_path / "out.parquet")
+    expected = pipeline.apply(ts)
+    assert list(streamed.df.columns) == list(expected.df.columns)
+    assert np.allclose(streamed.df, expected.df, equal_nan=True)
+
+
+def test_stream_unsupported():
+    pipeline = Pipeline().push(normalization())
+    with pytest.raises(ValueError):
+        list(pipeline.apply_stream([sample_ts()]))
+
+
+def test_parquet_projection(tmp_path):
+    ts = sample_ts()
+    tio.write_as_parquet(ts, tmp_path / "ts.parquet", row_group_size=100)
+    ts2 = tio.read_from_parquet_file(
+        tmp_path / "ts.parquet", columns=["b"], time_range=(100, 300), memory_map=True
+    )
+    assert list(ts2.df.columns) == ["ticks", "b"]
+    assert all(ts2.time_array() == np.arange(50, 150) * 2)
+    assert all(ts2.df["b"].to_numpy() == ts.df["b"].to_numpy()[50:150])
+
+    ts3 = tio.ts_from_arrow_table(
+        pa.Table.from_pandas(ts.df), "ticks", columns=["a"], time_range=(None, 10)
+    )
+    assert list(ts3.df.columns) == ["ticks", "a"]
+    assert all(ts3.time_array() == [0, 2, 4, 6, 8])
+
+
+def test_zero_copy():
+    table = pa.table(
+        {
+            "ticks": np.arange(5),
+            "a": np.arange(5.0),
+            "b": pa.array([1.0, None, 2.0, 3.0, 4.0]),
+        }
+    )
+    with pytest.warns(UserWarning, match=r"\['b'\]"):
+        ts = tio.ts_from_arrow_table(table, "ticks", zero_copy=True)
+    assert all(ts.df["a"] == np.arange(5.0))
+    assert np.isnan(ts.df["b"][1])
+
+    ts = sample_ts()
+    table = pa.Table.from_pandas(ts.df)
+    ts2 = tio.ts_from_arrow_table(table, "ticks", zero_copy=True)
+    assert ts.df.equals(ts2.df)
+
+    # The columns are read-only views of the arrow buffers
+    with pytest.raises(ValueError, match="read-only"):
+        ts2.df.loc[0, "a"] = 100.0
+    ts3 = ts2.copy()
+    ts3.df.loc[0, "a"] = 100.0
+    assert ts2.df["a"][0] == ts.df["a"][0]
+
+    def set_first(ts):
+        ts.df.loc[0, "a"] = 100.0
+        return ts
+
+    ts4 = Pipeline().push(set_first).apply(ts2)
+    assert ts4.df["a"][0] == 100.0
+    for kwargs in [{"copy_on_write": True}, {"inplace": True}]:
+        with pytest.raises(ValueError, match="read-only"):
+            Pipeline().push(set_first).apply(ts2, **kwargs)
+
+
+def test_ipc_roundtrip():
+    ts = sample_ts()
+    ts.df.set_index(ts.df.index + 3, inplace=True)
+    ts2 = tio.from_ipc(tio.to_ipc(ts))
+    assert ts2._time_column == "ticks"
+    assert ts.df.equals(ts2.df)
+    ts3 = tio.from_base64(tio.to_base64(ts, compression="zstd"))
+    assert ts.df.equals(ts3.df)
+
+
+def test_stream_parquet_range_index(tmp_path):
+    ts = sample_ts(100)
+    ts.df.index = pd.RangeIndex(5, 105)
+    tio.write_as_parquet(ts, tmp_path / "ts.parquet", row_group_size=30)
+    chunks = list(tio.iter_parquet_row_groups(tmp_path / "ts.parquet"))
+    assert all(np.concatenate([c.df.index for c in chunks]) == np.arange(5, 105))
+
+    pipeline = Pipeline().push_batch([add(1.0), index_to_time])
+    pipeline.apply_parquet(tmp_path / "ts.parquet", tmp_path / "out.parquet")
+    streamed = tio.read_from_parquet_file(tmp_path / "out.parquet")
+    expected = pipeline.apply(ts)
+    assert all(streamed.time_array() == np.arange(5, 105))
+    assert all(streamed.time_array() == expected.time_array())
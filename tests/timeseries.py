@@ -0,0 +1,152 @@
+import pandas as pd
+import numpy as np
+import pytest
+from timescale.timeseries import Timeseries
+
+
+def sample_ts():
+    df = pd.DataFrame(data={"ticks": [1, 2, 3], "a": [3, 2, 4], "b": [-1.0, 4.0, 9.0]})
+    ts = Timeseries(df, time_column="ticks")
+    return ts
+
+
+def test_validate():
+    ts = sample_ts()
+    assert ts.is_valid()
+    ts.set_time([1, 3, 3])
+    assert not ts.is_valid()
+    with pytest.raises(AssertionError):
+        ts.validate()
+    ts.set_time([1, 3, 4])
+    assert ts.is_valid()
+
+
+def test_validate_cache():
+    ts = sample_ts()
+    ts.validate()
+    assert ts._validated is not None
+    # Replacing the time column revalidates
+    ts.df["ticks"] = [3, 2, 1]
+    assert not ts.is_valid()
+    ts.df["ticks"] = [1, 2, 3]
+    assert ts.is_valid()
+    # Writing into the time column is only detected after invalidating
+    ts.df.loc[0, "ticks"] = 5
+    ts.invalidate()
+    assert not ts.is_valid()
+    ts.df = pd.DataFrame(data={"ticks": [1, 2, 3], "a": [3, 2, 4]})
+    assert ts._validated is None
+    assert ts.is_valid()
+
+
+def test_validate_datetime():
+    df = pd.DataFrame(
+        data={"time": pd.date_range("2024-03-05", periods=4, freq="s"), "a": range(4)}
+    )
+    ts = Timeseries(df)
+    assert ts.is_valid()
+    ts.set_time(df["time"].to_numpy()[::-1])
+    assert not ts.is_valid()
+
+
+def test_validate_type():
+    df = pd.DataFrame(data={"time": ["a", "b"], "a": [1.0, 2.0]})
+    ts = Timeseries(df)
+    with pytest.raises(AttributeError):
+        ts.validate()
+
+
+def test_from_arrays():
+    time = np.arange(4)
+    data = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]])
+    ts = Timeseries.from_arrays(time, data, columns=["a", "b"])
+    assert ts.is_array_backed()
+    assert len(ts) == 4
+    assert ts.data_columns() == ["a", "b"]
+    assert all(ts.data_df()["b"] == [2.0, 4.0, 6.0, 8.0])
+    assert all(ts.time_column() == [0, 1, 2, 3])
+    assert ts.is_array_backed()
+    assert ts.is_valid()
+
+    df = ts.df
+    assert not ts.is_array_backed()
+    assert list(df.columns) == ["time", "a", "b"]
+    df["a"] = 0.0
+    assert all(ts.data_array()[:, 0] == 0.0)
+
+
+def test_array_roundtrip():
+    ts = sample_ts()
+    ts.df.set_index(pd.Index([2, 3, 4]), inplace=True)
+    default = ts.copy()
+    ts.set_data(ts.data_array(), ts.data_dtypes())
+    assert ts.is_array_backed()
+    assert ts.df.equals(default.df)
+    assert all(ts.df.index == [2, 3, 4])
+
+
+def test_synthetic_stream():
+    from timescale.generator.synthetic import generate, generate_stream
+
+    for oscillation in ["sine", "square", "sawtooth", "random-walk"]:
+        parameters = dict(
+            channels=3, oscillation=oscillation, period=[10, 20, 40], noise=0.1, seed=5
+        )
+        ts = generate(1000, **parameters)
+        assert ts.is_valid()
+        chunks = list(generate_stream(1000, chunk_size=300, **parameters))
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        assert np.array_equal(
+            np.concatenate([chunk.time_array() for chunk in chunks]), ts.time_array()
+        )
+        assert np.allclose(
+            np.concatenate([chunk.data_array() for chunk in chunks]), ts.data_array()
+        )
+    ts = generate(100, 2, period=[10.0, 20.0], amplitude=2.0)
+    assert np.allclose(ts.data_array()[5], [0.0, 2.0])
+
+
+def test_append():
+    ts = Timeseries.from_arrays(np.arange(3), np.arange(6.0).reshape(3, 2))
+    snapshot = ts.copy(deep=False)
+    data = ts.data_array()
+    for start in range(3, 1000, 7):
+        ts.append(np.arange(start, start + 7), np.full((7, 2), float(start)))
+    assert len(ts) == 1004 and ts.is_valid()
+    assert np.array_equal(ts.time_array(), np.arange(1004))
+    assert np.array_equal(ts.data_array()[:3], data)
+    assert np.all(ts.data_array()[3:10] == 3.0)
+    assert list(ts.index) == list(range(1004))
+    # Earlier views and copies keep their rows
+    assert len(snapshot) == 3 and len(data) == 3
+    snapshot.append([3], [[-1.0, -1.0]])
+    assert np.all(ts.data_array()[3] == 3.0)
+
+    ts = sample_ts()
+    ts.df.set_index(pd.Index([2, 3, 4]), inplace=True)
+    with pytest.raises(AssertionError):
+        ts.append([4], [[1, 1.0]])
+    ts.append([4], [[1, 1.0]], index=[5])
+    assert list(ts.df.index) == [2, 3, 4, 5]
+    assert list(ts.df["a"]) == [3, 2, 4, 1]
+    # The index values are buffered like the rows, using the index in between doesn't copy them
+    snapshot = ts.copy(deep=False)
+    for t in range(5, 100):
+        ts.append([t], [[1, 1.0]], index=[t + 1])
+        assert ts.index[-1] == t + 1
+    assert list(ts.index) == [2, 3, 4, 5] + list(range(6, 101))
+    assert np.shares_memory(ts.index.to_numpy(), ts._index_buffer)
+    assert list(snapshot.index) == [2, 3, 4, 5]
+    ts.append([100], [[1, 1.0]], index=["last"])
+    assert ts.index[-1] == "last" and ts.index[0] == 2
+
+
+def test_append_empty_and_dtypes():
+    ts = sample_ts()
+    assert ts.df["a"].dtype.kind == "i"
+    ts.append([], [])
+    ts.append(np.empty(0), np.empty((0, 2)))
+    assert len(ts) == 3 and ts.df["a"].dtype.kind == "i"
+    ts.append([4], [[1.7, 2.0]])
+    assert ts.df["a"].dtype == np.float64
+    assert list(ts.df["a"]) == [3.0, 2.0, 4.0, 1.7]
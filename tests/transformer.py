@@ -1,3 +1,5 @@
+import copy
+import pytest
 import pandas as pd
 from timescale.timeseries import Timeseries
 from timescale.processing.pipeline import *
@@ -79,3 +81,279 @@ def test_cut_front():
     assert all(ts2.df["b"] == [9.0])
     assert all(ts2.time_column() == [3])
     assert all(ts2.df.index == [2])
+
+
+def test_copy_on_write():
+    ts = sample_ts()
+    pipeline = Pipeline()
+    pipeline.push(mult(2))
+    ts2 = pipeline.apply(ts, copy_on_write=True)
+    assert np.shares_memory(ts.time_array(), ts2.time_array())
+    assert all(ts2.df["a"] == [6, 4, 8])
+    assert all(ts.df["a"] == [3, 2, 4])
+    ts2.df.loc[2, "ticks"] = 100
+    ts2.df.loc[2, "b"] = 100.0
+    assert all(ts.time_column() == [1, 2, 3])
+    assert all(ts.df["b"] == [-1.0, 4.0, 9.0])
+    assert 0 < pipeline.copied_bytes < ts.df.memory_usage(index=False).sum()
+
+    ts2 = pipeline.apply(ts)
+    assert pipeline.copied_bytes == ts.df.memory_usage(index=False).sum()
+
+
+def test_copy_on_write_untouched_columns():
+    n = 1000
+    df = pd.DataFrame({"ticks": np.arange(n), "a": np.ones(n), "b": np.zeros(n)})
+    ts = Timeseries(df, time_column="ticks")
+    pipeline = Pipeline().push(index_to_time)
+    ts2 = pipeline.apply(ts, copy_on_write=True)
+    assert np.shares_memory(ts2.df["a"].to_numpy(), ts.df["a"].to_numpy())
+    assert pipeline.copied_bytes == n * 8
+    # Shared columns are read-only, replacing them works
+    with pytest.raises(ValueError, match="read-only"):
+        ts2.df.loc[0, "a"] = 100.0
+    ts2.df["a"] = 2.0
+    assert all(ts.df["a"] == 1.0)
+
+    array_backed = Timeseries.from_arrays([1, 2, 3], [[3.0], [2.0], [4.0]])
+    ts3 = Pipeline().push(index_to_time).apply(array_backed, copy_on_write=True)
+    assert np.shares_memory(ts3.data_array(), array_backed.data_array())
+    with pytest.raises(ValueError, match="read-only"):
+        ts3.data_array()[0, 0] = 100.0
+    assert array_backed.data_array()[0, 0] == 3.0
+
+
+def test_copy_on_write_inplace_stage():
+    def set_first(ts):
+        ts.df.loc[2, "b"] = 0.0
+        return ts
+
+    ts = sample_ts()
+    # Writing into a shared column raises like writing into `ts` itself would
+    with pytest.raises(ValueError, match="read-only"):
+        Pipeline().push(set_first).apply(ts, copy_on_write=True)
+    assert all(ts.df["b"] == [-1.0, 4.0, 9.0])
+    ts2 = Pipeline().push(set_first).apply(ts)
+    assert all(ts2.df["b"] == [0.0, 4.0, 9.0])
+    assert all(ts.df["b"] == [-1.0, 4.0, 9.0])
+
+
+def test_fused():
+    ts = sample_ts()
+    ts2 = Pipeline().push_batch([add(1), mult(3), add(-3)]).apply(ts)
+    assert all(ts2.df["a"] == [9, 6, 12])
+    assert ts2.df.dtypes.equals(ts.df.dtypes)
+
+    stages = [normalization(-1.0, 1.0), mult(3.0), add(2.5)]
+    unfused = copy.deepcopy(ts)
+    for f in stages:
+        unfused = f(unfused)
+    ts3 = Pipeline().push_batch(stages).apply(ts)
+    assert ts3.df.equals(unfused.df)
+
+
+def test_copy_on_write_float_frame():
+    ts = Timeseries(pd.DataFrame(data={"time": [0, 1, 2], "a": [1.0, 2.0, 3.0]}))
+    ts2 = Pipeline().normalize().apply(ts, copy_on_write=True)
+    assert all(ts2.df["a"] == [0.0, 0.5, 1.0])
+    assert all(ts.df["a"] == [1.0, 2.0, 3.0])
+    ts3 = Pipeline().normalize().apply(ts)
+    assert all(ts3.df["a"] == [0.0, 0.5, 1.0])
+    assert all(ts.df["a"] == [1.0, 2.0, 3.0])
+
+
+def test_noise():
+    from timescale.processing.noise import gaussian_noise, range_noise, uniform_noise
+
+    ts = Timeseries.from_arrays(np.arange(10000), np.zeros((10000, 2)))
+    noisy = Pipeline().push(uniform_noise(2.0, seed=1)).apply(ts)
+    assert np.all(np.abs(noisy.data_array()) <= 1.0)
+    assert not np.any(ts.data_array())
+    again = Pipeline().push(uniform_noise(2.0, seed=1)).apply(ts)
+    assert np.array_equal(noisy.data_array(), again.data_array())
+
+    noisy = Pipeline().push(gaussian_noise(0.5, seed=2)).apply(ts)
+    assert np.allclose(np.std(noisy.data_array(), axis=0), 0.5, rtol=0.05)
+
+    ts = sample_ts()
+    noisy = Pipeline().push(range_noise(0.01, distribution="uniform", seed=3)).apply(ts)
+    # The range of "a" is 2, the one of "b" is 10
+    offsets = noisy.data_array() - ts.data_array()
+    assert np.all(np.abs(offsets) <= [0.01, 0.05])
+    assert all(noisy.time_column() == ts.time_column())
+
+
+def test_profile():
+    reports = []
+    pipeline = (
+        Pipeline()
+        .push(add(1.0))
+        .push(mult(2.0))
+        .push(cut_front(1))
+        .push(index_to_time)
+        .profile(sink=reports.append)
+    )
+    ts = pipeline.apply(sample_ts(), copy_on_write=True)
+    assert [r.stage for r in pipeline.report] == [
+        "adder+multiplier",
+        "cut_front_inner",
+        "index_to_time",
+    ]
+    assert reports == pipeline.report
+    fused, cut, to_time = pipeline.report
+    assert (fused.rows_in, fused.rows_out, cut.rows_out) == (3, 3, 2)
+    assert fused.copied and fused.copied_bytes >= 3 * 2 * 8
+    assert fused.allocated_bytes is not None and fused.peak_bytes >= 0
+    assert to_time.copied_bytes <= 2 * 8
+    assert all(ts.df["a"] == [6, 10])
+
+    pipeline.profile(enabled=False)
+    pipeline.report = None
+    pipeline.apply(sample_ts())
+    assert pipeline.report is None
+
+
+def test_interpolate_kernels():
+    df = pd.DataFrame(data={"time": [0.0, 1.0, 3.0, 4.0], "a": [0.0, 2.0, 6.0, 8.0]})
+    ts = Timeseries(df)
+    linear = Pipeline().push(interpolate_count(5)).apply(ts)
+    assert np.allclose(linear.data_array()[:, 0], [0.0, 2.0, 4.0, 6.0, 8.0])
+    nearest = Pipeline().push(interpolate_count(3, kernel="nearest")).apply(ts)
+    assert np.allclose(nearest.data_array()[:, 0], [0.0, 2.0, 8.0])
+    hold = Pipeline().push(interpolate_count(5, kernel="zero-order-hold")).apply(ts)
+    assert np.allclose(hold.data_array()[:, 0], [0.0, 2.0, 2.0, 6.0, 8.0])
+
+
+def test_interpolate_aggregation():
+    ts = Timeseries.from_arrays(np.arange(6), np.arange(12.0).reshape(6, 2))
+    for aggregation, expected in [("mean", [1.0, 5.0, 9.0]), ("max", [2.0, 6.0, 10.0])]:
+        pipeline = Pipeline().push(interpolate_count(3, aggregation=aggregation))
+        result = pipeline.apply(ts)
+        assert np.allclose(result.time_array(), [0.0, 2.5, 5.0])
+        assert np.allclose(result.data_array()[:, 0], expected)
+        assert np.allclose(result.data_array()[:, 1], np.array(expected) + 1)
+    # Upsampling interpolates
+    ts = Pipeline().push(interpolate_count(11, aggregation="min")).apply(ts)
+    assert np.allclose(ts.data_array()[:, 0], np.arange(11.0))
+
+
+def test_decimation_pyramid():
+    from timescale.processing.decimation import DecimationPyramid, lttb, minmax
+
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(size=100_000))
+    time = np.arange(len(values))
+    positions = minmax(values, 100)
+    assert len(positions) <= 200 and np.all(np.diff(positions) > 0)
+    assert values.argmax() in positions and values.argmin() in positions
+    positions = lttb(time, values, 500)
+    assert len(positions) == 500 and positions[0] == 0 and positions[-1] == 99_999
+
+    pyramid = DecimationPyramid(time, values, min_points=1000)
+    x, y = pyramid.query(max_points=2000)
+    assert len(x) <= 2000 and y.max() == values.max() and y.min() == values.min()
+    # Zooming in returns the original points with one point beyond each border
+    x, y = pyramid.query(1000, 2000, max_points=2000)
+    assert np.array_equal(x, time[999:2002]) and np.array_equal(y, values[999:2002])
+    x, y = pyramid.query(0, 50_000, max_points=2000, method="lttb")
+    assert len(x) == 2000
+
+
+def test_online_stream():
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.normal(size=(1000, 2)), axis=0)
+    ts = Timeseries.from_arrays(np.arange(1000), data)
+    pipeline = (
+        Pipeline()
+        .push(online_normalization(-1.0, 1.0))
+        .push(smoothing_basic(5))
+        .push(smoothing_exponential())
+    )
+    expected = pipeline.apply(ts).data_array()
+    step = pipeline.stream()
+    live = Timeseries.from_arrays([], np.empty((0, 2)))
+    for start in range(0, 1000, 37):
+        chunk = Timeseries.from_arrays(
+            np.arange(start, min(start + 37, 1000)), data[start : start + 37]
+        )
+        chunk = step(chunk)
+        live.append(chunk.time_array(), chunk.data_array())
+    assert np.allclose(live.data_array(), expected, equal_nan=True)
+    assert np.array_equal(live.time_array(), np.arange(1000))
+
+
+def test_rolling():
+    from numpy.lib.stride_tricks import sliding_window_view
+    from timescale.processing import rolling
+
+    rng = np.random.default_rng(0)
+    data = np.cumsum(rng.normal(size=(500, 3)), axis=0)
+    data[100, 1] = np.nan
+    df = pd.DataFrame(data)
+    for window in [1, 2, 7, 64, 501]:
+        r = df.rolling(window)
+        for ours, theirs in [
+            (rolling.window_min(data, window), r.min()),
+            (rolling.window_max(data, window), r.max()),
+            (rolling.window_mean(data, window), r.mean()),
+            (rolling.window_var(data, window), r.var()),
+            (rolling.window_median(data, window), r.median()),
+            (rolling.window_quantile(data, window, 0.3), r.quantile(0.3)),
+        ]:
+            assert np.allclose(ours, theirs.to_numpy(), equal_nan=True)
+    # A level shift doesn't cancel the variance of later windows
+    level = np.zeros((2000, 1))
+    level[500:, 0] = 1e6 + np.cumsum(rng.normal(size=1500))
+    for window in [5, 64]:
+        exact = sliding_window_view(level[:, 0], window).var(axis=1, ddof=1)
+        ours = rolling.window_var(level, window)[window - 1 :, 0]
+        assert np.allclose(ours, exact, rtol=1e-9, atol=0.0)
+    ts = Timeseries.from_arrays(np.arange(500), data)
+    pipeline = Pipeline().push(rolling.rolling_max(20)).push(rolling.rolling_std(5))
+    expected = pipeline.apply(ts).data_array()
+    step = pipeline.stream()
+    chunks = [
+        step(
+            Timeseries.from_arrays(np.arange(s, min(s + 13, 500)), data[s : s + 13])
+        ).data_array()
+        for s in range(0, 500, 13)
+    ]
+    assert np.allclose(np.concatenate(chunks), expected, equal_nan=True)
+
+
+def test_segmentation():
+    from timescale.processing.segments import Segments
+
+    rng = np.random.default_rng(0)
+    data = np.asfortranarray(rng.normal(size=(103, 2)))
+    segments = Segments(data, 10, 5)
+    assert len(segments) == 19 and np.shares_memory(segments.windows, data)
+    windows = [data[s : s + 10] for s in range(0, 94, 5)]
+    assert np.allclose(segments.mean(), [w.mean(axis=0) for w in windows])
+    assert np.allclose(segments.energy(), [(w**2).sum(axis=0) for w in windows])
+    assert np.allclose(segments.min(), [w.min(axis=0) for w in windows])
+    assert np.allclose(segments.max(), [w.max(axis=0) for w in windows])
+    slopes = [np.polyfit(np.arange(10), w, 1)[0] for w in windows]
+    assert np.allclose(segments.slope(), slopes)
+    padded = Segments(data, 10, 5, padding="edge")
+    assert len(padded) == 20 and np.all(padded.windows[-1, 8:] == data[-1])
+    ts = Timeseries.from_arrays(np.arange(103) * 2, data, columns=["a", "b"])
+    ts2 = Pipeline().push(segmentation(10, 5, features=("max", "slope"))).apply(ts)
+    assert list(ts2.data_columns()) == ["a-max", "b-max", "a-slope", "b-slope"]
+    assert np.array_equal(ts2.time_array(), np.arange(0, 94, 5) * 2)
+    assert np.allclose(ts2.data_array()[:, 2:], slopes)
+
+
+def test_segmentation_sparse_padding():
+    from timescale.processing.segments import Segments
+
+    data = np.arange(10.0).reshape(-1, 1)
+    segments = Segments(data, 2, 20, padding="nan")
+    assert len(segments) == 1 and np.array_equal(segments.windows[0, :, 0], [0, 1])
+    segments = Segments(data, 3, 4, padding="zero")
+    assert np.array_equal(segments.starts(), [0, 4, 8])
+    assert np.array_equal(segments.windows[-1, :, 0], [8, 9, 0])
+    ts = Timeseries.from_arrays(np.arange(10), data)
+    ts2 = Pipeline().push(segmentation(2, 20, padding="nan")).apply(ts)
+    assert np.array_equal(ts2.time_array(), [0])
+    assert np.array_equal(ts2.data_array()[:, 0], [0.5])
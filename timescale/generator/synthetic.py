@@ -0,0 +1,176 @@
+"""
+Native generation of synthetic multi-channel series.
+All components are written straight into one preallocated array, so long series can be generated quickly.
+:func:`generate_stream` yields the same series in chunks without holding it in memory.
+"""
+
+from typing import Iterator
+
+import numpy as np
+from timescale.timeseries import Timeseries
+
+OSCILLATIONS = ("sine", "square", "sawtooth", "random-walk", "none")
+
+
+def _per_channel(value, channels: int, name: str) -> np.ndarray:
+    value = np.broadcast_to(np.asarray(value, dtype=np.float64), (channels,))
+    if not np.all(np.isfinite(value)):
+        raise ValueError(f"Argument `{name}` has to be finite.")
+    return value
+
+
+class _Generator:
+    # Writes consecutive blocks of one synthetic series, carrying the state between them
+    def __init__(
+        self,
+        channels,
+        oscillation,
+        period,
+        amplitude,
+        phase,
+        trend,
+        offset,
+        noise,
+        seed,
+    ):
+        if oscillation not in OSCILLATIONS:
+            raise ValueError(
+                f"Argument `oscillation` should be one of {OSCILLATIONS}, but is '{oscillation}'."
+            )
+        assert channels > 0
+        self.channels = channels
+        self.oscillation = oscillation
+        self.period = _per_channel(period, channels, "period")
+        self.amplitude = _per_channel(amplitude, channels, "amplitude")
+        self.phase = _per_channel(phase, channels, "phase")
+        self.trend = _per_channel(trend, channels, "trend")
+        self.offset = _per_channel(offset, channels, "offset")
+        self.noise = _per_channel(noise, channels, "noise")
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.walk = np.zeros(channels)
+
+    def fill(self, time: np.ndarray, data: np.ndarray):
+        # `time` holds the positions of the rows, `data` is overwritten
+        t = time[:, None]
+        k = self.channels
+        random_walk = self.oscillation == "random-walk"
+        noisy = bool(np.any(self.noise))
+        # All random numbers of a row are drawn together,
+        # so that the chunks of a stream continue the stream of the generator
+        draws = self.rng.standard_normal(size=(len(data), k * (random_walk + noisy)))
+        if random_walk:
+            np.multiply(draws[:, :k], self.amplitude, out=data)
+            np.cumsum(data, axis=0, out=data)
+            data += self.walk
+            if len(data):
+                self.walk = data[-1].copy()
+        elif self.oscillation == "none":
+            data[...] = 0.0
+        else:
+            # The fraction of the period passed at each row
+            np.divide(t, self.period, out=data)
+            data += self.phase / (2.0 * np.pi)
+            if self.oscillation == "sine":
+                data *= 2.0 * np.pi
+                np.sin(data, out=data)
+            else:
+                data %= 1.0
+                if self.oscillation == "square":
+                    np.less(data, 0.5, out=data, casting="unsafe")
+                data *= 2.0
+                data -= 1.0
+            data *= self.amplitude
+        if np.any(self.trend):
+            data += t * self.trend
+        data += self.offset
+        if noisy:
+            noise = draws[:, -k:]
+            noise *= self.noise
+            data += noise
+
+    def block(self, n: int, time_column: str) -> Timeseries:
+        time = np.arange(self.position, self.position + n)
+        self.position += n
+        data = np.empty((n, self.channels), order="F")
+        self.fill(time, data)
+        columns = [f"value-{i}" for i in range(self.channels)]
+        return Timeseries.from_arrays(time, data, columns, time_column=time_column)
+
+
+def generate(
+    n: int,
+    channels: int = 1,
+    oscillation: str = "sine",
+    period=100.0,
+    amplitude=1.0,
+    phase=0.0,
+    trend=0.0,
+    offset=0.0,
+    noise=0.0,
+    seed=None,
+    time_column: str = "timestamp",
+) -> Timeseries:
+    """Generates a synthetic `Timeseries` of `n` rows with the time column `time_column` (0, 1, ...)
+    and the data columns `value-0`, `value-1`, ...
+
+    Each channel is the sum of a base oscillation, a linear trend, an offset and gaussian noise.
+    All numeric parameters can be scalars or have one value per channel.
+
+    Parameters
+    ----------
+    oscillation
+        One of `"sine"`, `"square"`, `"sawtooth"`, `"random-walk"` or `"none"`.
+    period
+        The period of the oscillation in rows.
+    amplitude
+        The amplitude of the oscillation. The standard deviation of the steps of a random walk.
+    phase
+        The phase of the oscillation in radians.
+    trend
+        The slope of the linear trend per row.
+    offset
+        A constant added to all rows.
+    noise
+        The standard deviation of the gaussian noise.
+    seed
+        Seed of the random generator or a :class:`numpy.random.Generator`.
+    """
+    generator = _Generator(
+        channels, oscillation, period, amplitude, phase, trend, offset, noise, seed
+    )
+    return generator.block(n, time_column)
+
+
+def generate_stream(
+    n: int | None = None,
+    chunk_size: int = 2**20,
+    channels: int = 1,
+    oscillation: str = "sine",
+    period=100.0,
+    amplitude=1.0,
+    phase=0.0,
+    trend=0.0,
+    offset=0.0,
+    noise=0.0,
+    seed=None,
+    time_column: str = "timestamp",
+) -> Iterator[Timeseries]:
+    """Yields the series of :func:`generate` in consecutive chunks of `chunk_size` rows.
+    With the same `seed` the concatenated chunks equal the result of :func:`generate`.
+    The chunks can be consumed by :func:`timescale.processing.pipeline.Pipeline.apply_stream`.
+
+    Parameters
+    ----------
+    n
+        The total number of rows. The stream is endless if `None`.
+    chunk_size
+        The number of rows of each chunk. The last chunk may be shorter.
+    """
+    assert chunk_size > 0
+    generator = _Generator(
+        channels, oscillation, period, amplitude, phase, trend, offset, noise, seed
+    )
+    while n is None or generator.position < n:
+        size = chunk_size if n is None else min(chunk_size, n - generator.position)
+        yield generator.block(size, time_column)
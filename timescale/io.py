@@ -1,10 +1,23 @@
-from timescale.timeseries import Timeseries
+from timescale.timeseries import Timeseries, DEFAULT_TIME_COLUMN
+import timescale.utils as utils
 import pyarrow as pa
 import os
 import pandas as pd
+from typing import Iterable, Iterator, List, Tuple
 
 
-def write_as_parquet(ts: Timeseries, filepath: str | os.PathLike):
+def _ts_to_arrow_table(ts: Timeseries) -> pa.Table:
+    df = ts.df
+    table = pa.Table.from_pandas(df)
+    existing_metadata = table.schema.metadata
+    timescale_metadata = {b"time_column": ts._time_column.encode()}
+    merged_metadata = {**existing_metadata, **timescale_metadata}
+    return table.replace_schema_metadata(merged_metadata)
+
+
+def write_as_parquet(
+    ts: Timeseries, filepath: str | os.PathLike, row_group_size: int | None = None
+):
     """Writes a `Timeseries` object to a parquet file.
     This function requires pyarrow to be installed.
 
@@ -14,36 +27,153 @@ def write_as_parquet(ts: Timeseries, filepath: str | os.PathLike):
         The timeseries, which should be written to a file
     filepath
         The path of the parquet file
+    row_group_size
+        The maximum number of rows per row group. Smaller row groups allow reading the file in smaller chunks.
     """
     import pyarrow.parquet as pq
 
-    df = ts.df
-    table = pa.Table.from_pandas(df)
-    existing_metadata = table.schema.metadata
-    timescale_metadata = {b"time_column": ts._time_column.encode()}
-    merged_metadata = {**existing_metadata, **timescale_metadata}
-    table = table.replace_schema_metadata(merged_metadata)
+    pq.write_table(_ts_to_arrow_table(ts), filepath, row_group_size=row_group_size)
 
-    pq.write_table(table, filepath)
 
+def write_parquet_stream(chunks: Iterable[Timeseries], filepath: str | os.PathLike):
+    """Writes consecutive chunks of a `Timeseries` to a parquet file, one row group per chunk.
+    Only one chunk is held in memory at a time.
+    This function requires pyarrow to be installed.
 
-def ts_from_arrow_table(table, time_column=None) -> Timeseries:
+    Parameters
+    ----------
+    chunks
+        The chunks, e.g. as returned by :func:`Pipeline.apply_stream`.
+        All chunks need the same columns and time column.
+    filepath
+        The path of the parquet file
+    """
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for ts in chunks:
+            table = _ts_to_arrow_table(ts)
+            if writer is None:
+                writer = pq.ParquetWriter(filepath, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _resolve_time_column(schema: pa.Schema, time_column: str | int | None) -> str:
+    # Explicit argument > metadata written by `write_as_parquet` > default name
+    if isinstance(time_column, int):
+        return schema.names[time_column]
+    if time_column is not None:
+        return time_column
+    encoded_tc = (schema.metadata or {}).get(b"time_column")
+    if encoded_tc is None:
+        return DEFAULT_TIME_COLUMN
+    return encoded_tc.decode("UTF-8")
+
+
+def _projection(
+    schema: pa.Schema, time_column: str, columns: Iterable[str] | None
+) -> List[str] | None:
+    # The selected columns and the time column in the order of the schema
+    if columns is None:
+        return None
+    columns = set(columns) | {time_column}
+    return [c for c in schema.names if c in columns]
+
+
+def _time_filter(time_column: str, time_range: Tuple | None) -> List[Tuple] | None:
+    if time_range is None:
+        return None
+    start, end = time_range
+    filters = []
+    if start is not None:
+        filters.append((time_column, ">=", start))
+    if end is not None:
+        filters.append((time_column, "<", end))
+    return filters or None
+
+
+def _to_pandas_zero_copy(table: pa.Table) -> Tuple[pd.DataFrame, List[str]]:
+    # Returns the frame and the columns, which could not be converted without a copy
+    buffers = {
+        name: [
+            (b.address, b.address + b.size)
+            for chunk in table.column(name).chunks
+            for b in chunk.buffers()
+            if b is not None
+        ]
+        for name in table.column_names
+    }
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    copied = []
+    for c in df.columns:
+        values = df[c].to_numpy()
+        address = values.__array_interface__["data"][0]
+        if len(values) > 0 and not any(
+            low <= address < high for low, high in buffers.get(c, [])
+        ):
+            copied.append(c)
+    return df, copied
+
+
+def ts_from_arrow_table(
+    table, time_column=None, columns=None, time_range=None, zero_copy=False
+) -> Timeseries:
     """Converts a arrow table to a timeseries.
     This can fail if the `time_column` is not encoded in the metadata and can not be automatically detected.
+
+    Parameters
+    ----------
+    table
+        The arrow table
+    time_column
+        See :func:`read_from_parquet_file`
+    columns
+        The data columns to convert. All columns are converted if `None`.
+    time_range
+        A tuple `(start, end)`. Only rows with `start <= time < end` are converted.
+        Either bound can be `None`.
+    zero_copy
+        Keep columns as views of the arrow buffers where possible (numeric columns without nulls in a single chunk)
+        and release the arrow memory while converting. The table must not be used afterwards.
+        A warning lists the columns, which had to be copied.
+        The views are read-only: writing into them, e.g. `ts.df.loc[0, "a"] = 1.0` or a stage applied with
+        `Pipeline.apply(ts, inplace=True)`, raises a `ValueError`. Replacing columns works,
+        `ts.copy()` and `Pipeline.apply` without `inplace` or `copy_on_write` return writable copies.
     """
-    df = table.to_pandas()
-    if not time_column is None:
-        return Timeseries(df=df, time_column=time_column)
-    existing_metadata = table.schema.metadata
-    encoded_tc = existing_metadata.get(b"time_column")
-    if encoded_tc is None:
-        return Timeseries(df=df)
+    import pyarrow.parquet as pq
+
+    time_column = _resolve_time_column(table.schema, time_column)
+    projection = _projection(table.schema, time_column, columns)
+    if projection is not None:
+        index_columns = [
+            c for c in table.column_names if c.startswith("__index_level_")
+        ]
+        table = table.select(projection + index_columns)
+    filters = _time_filter(time_column, time_range)
+    if filters is not None:
+        table = table.filter(pq.filters_to_expression(filters))
+    if zero_copy:
+        df, copied = _to_pandas_zero_copy(table)
+        del table
+        if copied:
+            utils.warn(f"Columns {copied} could not be converted without a copy.")
     else:
-        return Timeseries(df=df, time_column=encoded_tc.decode("UTF-8"))
+        df = table.to_pandas()
+    return Timeseries(df=df, time_column=time_column)
 
 
 def read_from_parquet_file(
-    filepath: str | os.PathLike, time_column: str | int | None = None
+    filepath: str | os.PathLike,
+    time_column: str | int | None = None,
+    columns: Iterable[str] | None = None,
+    time_range: Tuple | None = None,
+    memory_map: bool = False,
+    zero_copy: bool = False,
 ) -> Timeseries:
     """Reads a `Timeseries` object from a file.
     This function requires pyarrow to be installed.
@@ -56,17 +186,70 @@ def read_from_parquet_file(
         The name of the column, which should be used for the `Timeseries`.
         If `timescale.io.write_as_parquet` was used to write the file, the `time_column` was already written to the metadata of the file.
         Furthermore a column 'time' is searched, if no metadata entry was found nor `time_column` was provided.
+    columns
+        The data columns to read. All columns are read if `None`. The time column is always read.
+    time_range
+        A tuple `(start, end)`. Only rows with `start <= time < end` are read.
+        Either bound can be `None`.
+        Row groups are skipped based on the statistics of the time column, so only matching row groups are decoded.
+    memory_map
+        Memory map the file instead of reading it into a buffer.
+    zero_copy
+        See :func:`ts_from_arrow_table`
     """
     import pyarrow.parquet as pq
 
-    table = pq.read_table(filepath)
-    return ts_from_arrow_table(table, time_column)
+    schema = pq.read_schema(filepath)
+    time_column = _resolve_time_column(schema, time_column)
+    table = pq.read_table(
+        filepath,
+        columns=_projection(schema, time_column, columns),
+        filters=_time_filter(time_column, time_range),
+        memory_map=memory_map,
+        use_pandas_metadata=True,
+    )
+    return ts_from_arrow_table(table, time_column, zero_copy=zero_copy)
+
+
+def iter_parquet_row_groups(
+    filepath: str | os.PathLike, time_column: str | int | None = None
+) -> Iterator[Timeseries]:
+    """Reads a parquet file row group by row group and yields every row group as `Timeseries`.
+    This allows processing files, which do not fit into memory.
+    This function requires pyarrow to be installed.
+
+    Parameters
+    ----------
+    filepath
+        The path of the parquet file
+    time_column
+        See :func:`read_from_parquet_file`
+    """
+    import pyarrow.parquet as pq
+
+    with pq.ParquetFile(filepath) as file:
+        # A range index is only stored as metadata of the whole file, pyarrow restores a zero based one for each row group
+        metadata = file.schema_arrow.pandas_metadata or {}
+        ranges = [
+            c
+            for c in metadata.get("index_columns", [])
+            if isinstance(c, dict) and c.get("kind") == "range"
+        ]
+        start, step = (ranges[0]["start"], ranges[0]["step"]) if ranges else (0, 1)
+        offset = 0
+        for i in range(file.num_row_groups):
+            ts = ts_from_arrow_table(file.read_row_group(i), time_column)
+            if isinstance(ts.df.index, pd.RangeIndex):
+                first = start + offset * step
+                ts.df.index = pd.RangeIndex(first, first + len(ts) * step, step)
+            offset += len(ts)
+            yield ts
 
 
 def to_json(ts: Timeseries) -> str:
     import json
 
-    ts_repr = ts.__dict__.copy()
+    ts_repr = {"_time_column": ts._time_column}
     ts_repr["df"] = ts.df.to_json(orient="records")
     return json.dumps(ts_repr)
 
@@ -78,3 +261,46 @@ def from_json(input: str) -> Timeseries:
     df_repr = json.loads(ts_repr["df"])
     df = pd.json_normalize(df_repr)
     return Timeseries(df, ts_repr["_time_column"])
+
+
+def to_ipc(ts: Timeseries, compression: str | None = None) -> bytes:
+    """Serializes a `Timeseries` to the binary arrow IPC stream format.
+    The time column is stored in the metadata of the schema.
+    This is much more compact and faster than :func:`to_json`.
+
+    Parameters
+    ----------
+    ts
+        The timeseries, which should be serialized
+    compression
+        Compression of the record batches, `"lz4"` or `"zstd"`. No compression if `None`.
+    """
+    table = _ts_to_arrow_table(ts)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_ipc(input: bytes) -> Timeseries:
+    """Deserializes a `Timeseries` written by :func:`to_ipc`."""
+    with pa.ipc.open_stream(pa.py_buffer(input)) as reader:
+        table = reader.read_all()
+    return ts_from_arrow_table(table)
+
+
+def to_base64(ts: Timeseries, compression: str | None = None) -> str:
+    """Serializes a `Timeseries` with :func:`to_ipc` and encodes it as base64 string,
+    e.g. for browser side stores.
+    """
+    import base64
+
+    return base64.b64encode(to_ipc(ts, compression)).decode("ascii")
+
+
+def from_base64(input: str) -> Timeseries:
+    """Deserializes a `Timeseries` written by :func:`to_base64`."""
+    import base64
+
+    return from_ipc(base64.b64decode(input))
@@ -1,3 +1,4 @@
+from __future__ import annotations
 from timescale.processing.pipeline import (
     Pipeline,
     normalization,
@@ -10,7 +11,9 @@ import numpy as np
 
 from plotly.graph_objects import Figure
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Tuple
 
 
 @dataclass
@@ -19,42 +22,215 @@ class Alignment:
     translation: float
 
 
-def align(ts1, ts2, alignerclass):
+def align(
+    ts1,
+    ts2,
+    alignerclass,
+    cache: TransformCache | None = None,
+    aligner_kwargs: dict | None = None,
+):
+    """Returns a function, which scores a `(translation, scale)` pair of `ts1` and `ts2` with the given aligner class.
+    All calls share a :class:`TransformCache`, which is available as the attribute `cache` of the function.
+    The aligners are created with the keyword arguments `aligner_kwargs`, e.g. `{"band": 5}` for :class:`DTWAligner`.
+    """
+    cache = TransformCache() if cache is None else cache
+    aligner_kwargs = aligner_kwargs or {}
+
     def inner(translation: float, scale: float):
         alignment = Alignment(scale, translation)
-        aligner = alignerclass(ts1, ts2)
+        aligner = alignerclass(ts1, ts2, transform_cache=cache, **aligner_kwargs)
         aligner.transform(alignment)
         return aligner.alignment_score()
 
+    inner.cache = cache
+    return inner
+
+
+def align_batch(
+    ts1,
+    ts2,
+    alignerclass,
+    cache: TransformCache | None = None,
+    aligner_kwargs: dict | None = None,
+):
+    """Like :func:`align`, but the returned function scores many candidates at once.
+    It takes an array of shape `(k, 2)` with one `(translation, scale)` pair per row and returns the `k` scores.
+    See :func:`BaseAligner.score_batch`.
+    """
+    cache = TransformCache() if cache is None else cache
+
+    def inner(candidates) -> np.ndarray:
+        return alignerclass.score_batch(ts1, ts2, candidates, cache, aligner_kwargs)
+
+    inner.cache = cache
     return inner
 
 
 def translate(ts: Timeseries, translation: float):
-    ts.df[ts._time_column] = [x + int(translation) for x in ts.time_column()]
-    if not translation.is_integer():
+    ts.set_time(ts.time_array() + int(translation))
+    if not float(translation).is_integer():
         lam = translation - int(translation)
-        data_df = ts.data_df()
-        for c in data_df:
-            x = data_df[c].to_numpy()
-            one_shift = pd.Series(x[1:]).to_numpy()
-            one_shift = np.append(one_shift, x[-1])
-            ts.df[c] = (1.0 - lam) * x + lam * one_shift
+        x = ts.data_array()
+        one_shift = np.concatenate([x[1:], x[-1:]])
+        ts.set_data((1.0 - lam) * x + lam * one_shift)
+
+
+class TransformCache:
+    """Least recently used cache for the parts of :func:`BaseAligner.transform`, which don't depend on the translation:
+    the normalized ts1 and the interpolated (and normalized) ts2 for each scaled length `new_n`.
+    Scales, which result in the same `new_n`, share their entries.
+
+    Entries are bound to the identity of the input series, which must not be modified while they are cached.
+
+    Parameters
+    ----------
+    max_bytes
+        Upper bound of the memory held by all entries. The least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key, source: Timeseries, compute: Callable[[], Timeseries]):
+        """Returns the cached result for `key` and `source` or computes and caches it."""
+        key = (key, id(source))
+        entry = self._entries.get(key)
+        # Holding a reference to the source keeps its id from being reused
+        if entry is not None and entry[0] is source:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        value = compute()
+        nbytes = sum(buffer.nbytes for buffer in value._buffers())
+        if nbytes <= self.max_bytes:
+            self._entries[key] = (source, value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __repr__(self) -> str:
+        return f"TransformCache(entries={len(self._entries)}, bytes={self.nbytes}, hits={self.hits}, misses={self.misses})"
+
+
+def _scaled_length(ts: Timeseries, scale: float) -> int:
+    # Scales computed from grid steps are off by rounding errors, e.g. 1.0005 - 0.0005 < 1.0,
+    # which must not cost a whole data point
+    return int(len(ts) * scale + 1e-9)
+
+
+def _normalize(ts: Timeseries, inplace=False) -> Timeseries:
+    return (
+        Pipeline()
+        .push(normalization(-1.0, 1.0))
+        .apply(ts, inplace=inplace, copy_on_write=True)
+    )
+
+
+def _scale(ts2: Timeseries, new_n: int, cache: TransformCache) -> Timeseries:
+    def compute():
+        return (
+            Pipeline()
+            .push(interpolate_count(n=new_n))
+            .push(index_to_time)
+            .apply(ts2, copy_on_write=True)
+        )
+
+    return cache.get(("scaled", new_n), ts2, compute)
+
+
+def _transform_ts2(
+    ts2: Timeseries, alignment: Alignment, cache: TransformCache
+) -> Timeseries:
+    new_n = _scaled_length(ts2, alignment.scale)
+    # The time column is final after translating, resetting it to the index would undo the translation.
+    if float(alignment.translation).is_integer():
+        # Integer translations only shift the time column, so the normalization of the scaled series can be reused.
+        ts_normalized2 = cache.get(
+            ("normalized", new_n), ts2, lambda: _normalize(_scale(ts2, new_n, cache))
+        )
+        ts = ts_normalized2.copy(deep=False)
+        translate(ts, alignment.translation)
+        return ts
+    ts = _scale(ts2, new_n, cache).copy(deep=False)
+    translate(ts, alignment.translation)
+    return _normalize(ts, inplace=True)
+
+
+def _transform_ts1(ts1: Timeseries, cache: TransformCache) -> Timeseries:
+    def compute():
+        return (
+            Pipeline()
+            .push(normalization(-1.0, 1.0))
+            .push(index_to_time)
+            .apply(ts1, copy_on_write=True)
+        )
+
+    return cache.get(("normalized",), ts1, compute).copy(deep=False)
 
 
 @dataclass
 class BaseAligner(ABC):
     ts1: Timeseries
     ts2: Timeseries
+    # Shares the work of `transform` between aligners of the same series
+    transform_cache: TransformCache | None = field(
+        default=None, repr=False, compare=False
+    )
 
     def transform(self, alignment: Alignment):
-        norm_pipeline = Pipeline().push(normalization(-1.0, 1.0)).push(index_to_time)
-        pipeline = Pipeline()
-        new_n = int(self.ts2.df.shape[0] * alignment.scale)
-        pipeline.push(interpolate_count(n=new_n)).push(index_to_time)
-        ts_trans2 = pipeline.apply(self.ts2)
-        translate(ts_trans2, alignment.translation)
-        self.ts2 = norm_pipeline.apply(ts_trans2)
-        self.ts1 = norm_pipeline.apply(self.ts1)
+        cache = self.transform_cache
+        if cache is None:
+            cache = TransformCache(max_bytes=0)
+        self.ts2 = _transform_ts2(self.ts2, alignment, cache)
+        self.ts1 = _transform_ts1(self.ts1, cache)
+
+    @classmethod
+    def score_batch(
+        cls,
+        ts1: Timeseries,
+        ts2: Timeseries,
+        candidates,
+        cache: TransformCache | None = None,
+        aligner_kwargs: dict | None = None,
+    ) -> np.ndarray:
+        """Returns the `alignment_score` of many alignments of `ts1` and `ts2`.
+        Work, which doesn't depend on the translation, is shared between all candidates with the same scaled length
+        through a :class:`TransformCache`: `ts1` is normalized once, `ts2` is interpolated and normalized once per scaled length.
+
+        Parameters
+        ----------
+        candidates
+            Array of shape `(k, 2)` with one `(translation, scale)` pair per row.
+        cache
+            The cache to use. A new cache is used for this batch if `None`.
+        aligner_kwargs
+            Keyword arguments of the aligners besides the series, e.g. `{"band": 5}` for :class:`DTWAligner`.
+        """
+        cache = TransformCache() if cache is None else cache
+        aligner_kwargs = aligner_kwargs or {}
+        candidates = np.asarray(candidates, dtype=np.float64).reshape(-1, 2)
+        scores = np.empty(len(candidates))
+        ts_normalized1 = _transform_ts1(ts1, cache)
+        lengths = np.array([_scaled_length(ts2, scale) for scale in candidates[:, 1]])
+        # Candidates with the same scaled length are scored one after another to keep their entries in the cache
+        for i in np.argsort(lengths, kind="stable"):
+            translation, scale = candidates[i]
+            ts_trans2 = _transform_ts2(ts2, Alignment(scale, translation), cache)
+            scores[i] = cls(
+                ts_normalized1, ts_trans2, **aligner_kwargs
+            ).alignment_score()
+        return scores
 
     @abstractmethod
     def alignment_score(self) -> float:
@@ -66,16 +242,65 @@ class BaseAligner(ABC):
         pass
 
 
-def calculate_eucl_distance(ts1: Timeseries, ts2: Timeseries):
-    cols1 = [n + "_x" for n in ts1.data_df().columns]
-    cols2 = [n + "_y" for n in ts2.data_df().columns]
-    size = min(len(cols1), len(cols2))
+def join_sorted(
+    ts1: Timeseries, ts2: Timeseries
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Inner join of two `Timeseries` on their time columns without building a `DataFrame`.
+    The time column of `ts1` has to be strictly sorted.
+
+    Returns
+    -------
+    time, data1, data2
+        The common times in the order of `ts2` and the rows of the data of `ts1` and `ts2` at these times.
+    """
+    time1, time2 = ts1.time_array(), ts2.time_array()
+    positions = np.searchsorted(time1, time2)
+    found = positions < len(time1)
+    found[found] = time1[positions[found]] == time2[found]
+    return time2[found], ts1.data_array()[positions[found]], ts2.data_array()[found]
+
+
+def eucl_distance_rows(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    # channels are compared pairwise
+    size = min(data1.shape[1], data2.shape[1])
+    return np.sum(1.0 - np.abs(data1[:, :size] - data2[:, :size]), axis=1)
+
+
+def sum_rows(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    return np.abs(np.sum(data1, axis=1) + np.sum(data2, axis=1))
+
+
+def corr_rows(data1: np.ndarray, data2: np.ndarray) -> np.ndarray:
+    return np.prod(data1, axis=1) * np.prod(data2, axis=1)
+
+
+def join_score(ts1: Timeseries, ts2: Timeseries, rows) -> float:
+    """Sums the scores of all rows with a common time, see :func:`join_sorted`."""
+    _, data1, data2 = join_sorted(ts1, ts2)
+    return np.sum(rows(data1, data2))
+
+
+def _merge(ts1: Timeseries, ts2: Timeseries, rows) -> pd.DataFrame:
+    # Merged `DataFrame` of both series with the score of each row in the column "result"
     df = pd.merge(ts1.df, ts2.df, left_on=ts1._time_column, right_on=ts2._time_column)
-    diff = np.abs(df[cols1[:size]].to_numpy() - df[cols2[:size]].to_numpy())
-    df["result"] = 1.0 - diff
+    data = df.loc[
+        :,
+        [
+            a and b
+            for a, b in zip(
+                df.columns != ts1._time_column, df.columns != ts2._time_column
+            )
+        ],
+    ].to_numpy(dtype=np.float64)
+    size1 = len(ts1.data_columns())
+    df["result"] = rows(data[:, :size1], data[:, size1:])
     return df
 
 
+def calculate_eucl_distance(ts1: Timeseries, ts2: Timeseries):
+    return _merge(ts1, ts2, eucl_distance_rows)
+
+
 class EuclidianAligner(BaseAligner):
     def apply(self):
         if hasattr(self, "cache"):
@@ -85,8 +310,7 @@ class EuclidianAligner(BaseAligner):
             return self.apply()
 
     def alignment_score(self):
-        sums = self.apply()
-        return np.sum(sums["result"])
+        return join_score(self.ts1, self.ts2, eucl_distance_rows)
 
     def add_visualization(self, figure: Figure):
         sums = self.apply()
@@ -94,17 +318,7 @@ class EuclidianAligner(BaseAligner):
 
 
 def calculate_sum(ts1, ts2):
-    df = pd.merge(ts1.df, ts2.df, left_on=ts1._time_column, right_on=ts2._time_column)
-    df["result"] = df.loc[
-        :,
-        [
-            a and b
-            for a, b in zip(
-                df.columns != ts1._time_column, df.columns != ts2._time_column
-            )
-        ],
-    ].apply(lambda x: np.abs(np.sum(x)), axis=1)
-    return df
+    return _merge(ts1, ts2, sum_rows)
 
 
 class SumAligner(BaseAligner):
@@ -116,8 +330,7 @@ class SumAligner(BaseAligner):
             return self.apply()
 
     def alignment_score(self):
-        sums = self.apply()
-        return np.sum(sums["result"])
+        return join_score(self.ts1, self.ts2, sum_rows)
 
     def add_visualization(self, figure: Figure):
         sums = self.apply()
@@ -125,18 +338,7 @@ class SumAligner(BaseAligner):
 
 
 def calculate_corr(ts1, ts2):
-    df = pd.merge(ts1.df, ts2.df, left_on=ts1._time_column, right_on=ts2._time_column)
-
-    df["result"] = df.loc[
-        :,
-        [
-            a and b
-            for a, b in zip(
-                df.columns != ts1._time_column, df.columns != ts2._time_column
-            )
-        ],
-    ].apply(np.prod, axis=1)
-    return df
+    return _merge(ts1, ts2, corr_rows)
 
 
 class CorrelationAligner(BaseAligner):
@@ -148,8 +350,54 @@ class CorrelationAligner(BaseAligner):
             return self.apply()
 
     def alignment_score(self):
-        correlations = self.apply()
-        return np.sum(correlations["result"])
+        return join_score(self.ts1, self.ts2, corr_rows)
+
+    def translation_scores(self, scale: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the `alignment_score` for every integer translation with an overlap at the given scale.
+        All scores are calculated at once with a FFT cross-correlation in O(n log n).
+        The aligner itself should not be transformed yet.
+
+        Returns
+        -------
+        translations, scores
+            The integer translations in ascending order and their scores.
+        """
+        aligner = CorrelationAligner(self.ts1, self.ts2, self.transform_cache)
+        aligner.transform(Alignment(scale, 0.0))
+        time1 = aligner.ts1.time_array()
+        if len(time1) > 1 and np.any(np.diff(time1) != 1):
+            raise ValueError(
+                "The index of ts1 has to consist of consecutive integers to calculate all translations at once."
+            )
+        # The score of a row is the product of all data columns of both series, see `corr_rows`
+        p1 = np.prod(aligner.ts1.data_array(), axis=1)
+        p2 = np.prod(aligner.ts2.data_array(), axis=1)
+        n, m = len(p1), len(p2)
+        length = 1 << (n + m - 2).bit_length()
+        correlation = np.fft.irfft(
+            np.fft.rfft(p1, length) * np.conj(np.fft.rfft(p2, length)), length
+        )
+        # correlation[k] is the score of translating ts2 by k (negative k wrap around)
+        scores = np.concatenate([correlation[length - (m - 1) :], correlation[:n]])
+        translations = np.arange(-(m - 1), n) + time1[0]
+        return translations, scores
+
+    def best_alignment(self, scale: float) -> Tuple[Alignment, float]:
+        """Returns the translation with the highest score at the given scale and its score.
+        The translation is refined below one sample by fitting a parabola through the peak and its neighbours.
+        See :func:`CorrelationAligner.translation_scores`.
+        """
+        translations, scores = self.translation_scores(scale)
+        k = int(np.argmax(scores))
+        translation, score = float(translations[k]), float(scores[k])
+        if 0 < k < len(scores) - 1:
+            left, right = scores[k - 1], scores[k + 1]
+            curvature = left - 2.0 * score + right
+            if curvature < 0:
+                delta = 0.5 * (left - right) / curvature
+                translation += delta
+                score -= 0.25 * (left - right) * delta
+        return Alignment(scale, translation), score
 
     def add_visualization(self, figure: Figure):
         correlations = self.apply()
@@ -158,3 +406,145 @@ class CorrelationAligner(BaseAligner):
             y=correlations["result"],
             name="correlation",
         )
+
+
+def sakoe_chiba_window(
+    time1: np.ndarray, time2: np.ndarray, band: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the Sakoe-Chiba band of two sorted time columns:
+    row `i` of the first series may be matched with the rows `lo[i]` up to (excluding) `hi[i]` of the second series,
+    whose times differ by at most `band`.
+    The windows are widened where necessary, such that a warping path from the first to the last pair of rows exists.
+    """
+    m = len(time2)
+    lo = np.searchsorted(time2, time1 - band, side="left")
+    hi = np.searchsorted(time2, time1 + band, side="right")
+    lo[0], hi[-1] = 0, m
+    lo = np.minimum(lo, m - 1)
+    hi = np.maximum.accumulate(np.maximum(hi, lo + 1))
+    # The window of a row has to touch the window of the previous row
+    lo[1:] = np.minimum(lo[1:], hi[:-1])
+    return lo, hi
+
+
+def banded_dtw(
+    data1: np.ndarray,
+    data2: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    with_path: bool = False,
+):
+    """Dynamic time warping of the rows of `data1` and `data2` restricted to a window, see :func:`sakoe_chiba_window`.
+    The cost of matching two rows is the sum of the absolute differences of their channels, which are compared pairwise.
+
+    Each row of the cost matrix is calculated at once:
+    the dependency on the left neighbour is resolved with a running minimum over the cumulative costs of the row.
+    Only the current row is kept, so the memory is O(w) for the cost and O(n·w) for the warping path.
+
+    Returns
+    -------
+    cost
+        The cost of the best warping path.
+    path
+        Only if `with_path` is set. Array of shape `(l, 2)` with the matched rows of `data1` and `data2` in ascending order.
+    """
+    size = min(data1.shape[1], data2.shape[1])
+    data1, data2 = data1[:, :size], data2[:, :size]
+    # 0: diagonal step, 1: step from the previous row, 2: step from the left
+    steps = []
+    previous, previous_lo, previous_hi = None, 0, 0
+    for i in range(len(data1)):
+        start, stop = lo[i], hi[i]
+        cost = np.sum(np.abs(data2[start:stop] - data1[i]), axis=1)
+        # `extended[t]` is the cost of the previous row at column `start - 1 + t`
+        extended = np.full(stop - start + 1, np.inf)
+        if previous is None:
+            extended[0] = 0.0
+        else:
+            first, last = max(previous_lo, start - 1), min(previous_hi, stop)
+            if first < last:
+                extended[first - start + 1 : last - start + 1] = previous[
+                    first - previous_lo : last - previous_lo
+                ]
+        diagonal, up = extended[:-1], extended[1:]
+        entry = cost + np.minimum(diagonal, up)
+        cumulative = np.cumsum(cost)
+        best = np.minimum.accumulate(entry - cumulative)
+        previous = cumulative + best
+        previous_lo, previous_hi = start, stop
+        if with_path:
+            step = (up < diagonal).astype(np.int8)
+            step[entry - cumulative > best] = 2
+            steps.append(step)
+    total = float(previous[-1])
+    if not with_path:
+        return total
+    i, j = len(data1) - 1, len(data2) - 1
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        step = steps[i][j - lo[i]]
+        if step != 1:
+            j -= 1
+        if step != 2:
+            i -= 1
+        path.append((i, j))
+    return total, np.array(path[::-1])
+
+
+def _overlap(ts: Timeseries, start, end) -> Tuple[np.ndarray, np.ndarray]:
+    time = ts.time_array()
+    first, last = np.searchsorted(time, [start, end], side="left")
+    last += last < len(time) and time[last] == end
+    return time[first:last], ts.data_array()[first:last]
+
+
+@dataclass
+class DTWAligner(BaseAligner):
+    """Scores the global alignment, but lets the rows of both series warp against each other by up to `band` time units.
+    This compensates local drift, e.g. of clocks, which a scale and a translation can't model.
+
+    The score matches the one of :class:`EuclidianAligner` on the best warping path:
+    the number of channels times the number of overlapping rows of `ts1` minus the cost of the path (see :func:`banded_dtw`).
+    With `band = 0` both aligners agree.
+    Only the overlapping time range of both series is warped and both time columns have to be sorted.
+    """
+
+    band: float = 10
+
+    def _warping(self, with_path: bool):
+        time1, time2 = self.ts1.time_array(), self.ts2.time_array()
+        if len(time1) == 0 or len(time2) == 0:
+            return None
+        start, end = max(time1[0], time2[0]), min(time1[-1], time2[-1])
+        if start > end:
+            return None
+        time1, data1 = _overlap(self.ts1, start, end)
+        time2, data2 = _overlap(self.ts2, start, end)
+        lo, hi = sakoe_chiba_window(time1, time2, self.band)
+        return time1, data1, time2, data2, banded_dtw(data1, data2, lo, hi, with_path)
+
+    def alignment_score(self):
+        warping = self._warping(with_path=False)
+        if warping is None:
+            return 0.0
+        _, data1, _, data2, cost = warping
+        return min(data1.shape[1], data2.shape[1]) * len(data1) - cost
+
+    def warping_path(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the times of the pairs of rows of `ts1` and `ts2` on the best warping path."""
+        warping = self._warping(with_path=True)
+        if warping is None:
+            return np.array([]), np.array([])
+        time1, _, time2, _, (_, path) = warping
+        return time1[path[:, 0]], time2[path[:, 1]]
+
+    def add_visualization(self, figure: Figure):
+        warping = self._warping(with_path=True)
+        if warping is None:
+            return
+        time1, data1, _, data2, (_, path) = warping
+        # The mean score of the pairs of each row of `ts1`
+        rows = eucl_distance_rows(data1[path[:, 0]], data2[path[:, 1]])
+        counts = np.bincount(path[:, 0], minlength=len(time1))
+        scores = np.bincount(path[:, 0], weights=rows, minlength=len(time1)) / counts
+        figure.add_bar(x=time1, y=scores, name="dtw")
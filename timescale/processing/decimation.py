@@ -0,0 +1,132 @@
+"""
+Decimation of series for plotting.
+:func:`minmax` keeps the extremes of each bucket, :func:`lttb` keeps the visually most important points
+(Largest Triangle Three Buckets). A :class:`DecimationPyramid` precomputes min/max envelopes of a series on several levels,
+so any visible range can be served with about as many points as the plot has pixels.
+"""
+
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+
+def minmax(values: np.ndarray, buckets: int) -> np.ndarray:
+    """Returns the sorted positions of the minimum and the maximum of each of `buckets` equally sized buckets of `values`.
+    NaN values are ignored, buckets of only NaN values keep their first position.
+    """
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(buckets, size)
+    # NaN never wins a comparison, so it is replaced to ignore it
+    lower = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    upper = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    offsets = np.arange(buckets) * size
+    return np.unique(np.concatenate([lower + offsets, upper + offsets]))
+
+
+def lttb(time: np.ndarray, values: np.ndarray, threshold: int) -> np.ndarray:
+    """Returns the sorted positions of `threshold` points chosen by Largest Triangle Three Buckets.
+    The first and the last point are always kept. The points of each bucket are scored at once,
+    but the buckets are processed one after another, because each choice depends on the previous one.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    time = np.asarray(time, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    # The inner points are split into `threshold - 2` buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for b in range(threshold - 2):
+        start, stop = edges[b], edges[b + 1]
+        # The third corner is the average of the next bucket
+        following = slice(stop, edges[b + 2]) if b + 2 < len(edges) else slice(n - 1, n)
+        x3, y3 = time[following].mean(), np.nanmean(values[following])
+        x1, y1 = time[previous], values[previous]
+        area = np.abs(
+            (x1 - x3) * (values[start:stop] - y1) - (x1 - time[start:stop]) * (y3 - y1)
+        )
+        previous = start + int(np.nanargmax(area)) if np.any(area >= 0) else start
+        selected[b + 1] = previous
+    return selected
+
+
+class DecimationPyramid:
+    """Min/max envelopes of one channel of a series on several levels.
+    Each level keeps the minimum and the maximum of every `factor` points of the level below,
+    level 0 is the series itself. The pyramid is built once, :func:`DecimationPyramid.query` only slices it.
+
+    Parameters
+    ----------
+    time
+        The sorted times of the series.
+    values
+        The values of one channel.
+    factor
+        The number of points of a level, which are reduced to a minimum and a maximum on the next level.
+    min_points
+        No further level is built once a level has at most this many points.
+    """
+
+    def __init__(self, time, values, factor: int = 8, min_points: int = 1024):
+        assert factor > 2
+        time, values = np.asarray(time), np.asarray(values, dtype=np.float64)
+        assert len(time) == len(values), "time and values have different lengths"
+        self.levels: List[Tuple[np.ndarray, np.ndarray]] = [(time, values)]
+        while len(self.levels[-1][0]) > min_points:
+            time, values = self.levels[-1]
+            positions = minmax(values, -(-len(values) // factor))
+            if len(positions) >= len(values):
+                break
+            self.levels.append((time[positions], values[positions]))
+
+    def __len__(self) -> int:
+        return len(self.levels[0][0])
+
+    def query(
+        self, start=None, end=None, max_points: int = 2000, method: str = "minmax"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the times and values of at most about `max_points` points in the range from `start` to `end`.
+        The finest level, which fits, is used. One point beyond each end is included, so lines continue at the border.
+
+        Parameters
+        ----------
+        start, end
+            The visible range. `None` for an open end.
+        method
+            `"minmax"` returns the envelope of the chosen level.
+            `"lttb"` reduces a finer level with :func:`lttb` to `max_points`, which is smoother but costs more.
+        """
+        if method not in ("minmax", "lttb"):
+            raise ValueError(
+                f"Argument `method` should be 'minmax' or 'lttb', but is '{method}'."
+            )
+        # LTTB starts with more points than it returns
+        budget = max_points * 4 if method == "lttb" else max_points
+        for time, values in self.levels:
+            first, last = self._range(time, start, end)
+            if last - first <= budget:
+                break
+        time, values = time[first:last], values[first:last]
+        if method == "lttb":
+            positions = lttb(time, values, max_points)
+            time, values = time[positions], values[positions]
+        return time, values
+
+    @staticmethod
+    def _range(time: np.ndarray, start, end) -> Tuple[int, int]:
+        first = 0 if start is None else max(np.searchsorted(time, start) - 1, 0)
+        last = (
+            len(time)
+            if end is None
+            else min(np.searchsorted(time, end, side="right") + 1, len(time))
+        )
+        return first, last
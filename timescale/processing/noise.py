@@ -1,15 +1,97 @@
-from numpy import random
+"""
+Noise stages for `Pipeline`s.
+Each stage draws the noise of all data columns at once from its own :class:`numpy.random.Generator`,
+so the result only depends on the `seed` and the number of previous applications of the stage.
+"""
+
+import numpy as np
+from timescale.processing.pipeline import apply_fused, elementwise, streamable
 from timescale.timeseries import Timeseries
 
 
-def uniform_noise(amount=1.0):
+def _to_float(d):
+    return np.dtype(np.float64)
+
+
+def uniform_noise(amount=1.0, seed=None):
+    """Adds noise, which is uniformly distributed in `[-amount / 2, amount / 2)`, to each data column.
+
+    Parameters
+    ----------
+    amount
+        The width of the interval of the noise.
+    seed
+        Seed of the random generator or a :class:`numpy.random.Generator`.
+    """
+    rng = np.random.default_rng(seed)
+
+    def kernel(block: np.ndarray) -> np.ndarray:
+        block += rng.uniform(-amount / 2.0, amount / 2.0, size=block.shape)
+        return block
+
+    @streamable()
+    @elementwise(kernel=kernel, dtype=_to_float)
     def _uniform_noise(ts: Timeseries):
-        df = ts.data_df()
-        for c in df:
-            for x in range(len(df[c])):
-                offset = random.rand() * amount - amount / 2.0
-                value = df[c][x] + offset
-                ts.df.loc[x, c] = value
-        return ts
+        return apply_fused(ts, [_uniform_noise])
 
     return _uniform_noise
+
+
+def gaussian_noise(std=1.0, seed=None):
+    """Adds normally distributed noise with mean 0 and standard deviation `std` to each data column.
+
+    Parameters
+    ----------
+    std
+        The standard deviation of the noise.
+    seed
+        Seed of the random generator or a :class:`numpy.random.Generator`.
+    """
+    rng = np.random.default_rng(seed)
+
+    def kernel(block: np.ndarray) -> np.ndarray:
+        block += rng.normal(0.0, std, size=block.shape)
+        return block
+
+    @streamable()
+    @elementwise(kernel=kernel, dtype=_to_float)
+    def _gaussian_noise(ts: Timeseries):
+        return apply_fused(ts, [_gaussian_noise])
+
+    return _gaussian_noise
+
+
+def range_noise(amount=0.1, distribution="gaussian", seed=None):
+    """Adds noise, which is scaled to the range `max - min` of each data column.
+    Channels of different magnitude get the same relative amount of noise.
+
+    Parameters
+    ----------
+    amount
+        The standard deviation (gaussian) or the width (uniform) of the noise relative to the range of the column.
+    distribution
+        Either `"gaussian"` or `"uniform"`.
+    seed
+        Seed of the random generator or a :class:`numpy.random.Generator`.
+    """
+    if distribution not in ("gaussian", "uniform"):
+        raise ValueError(
+            f"Argument `distribution` should be 'gaussian' or 'uniform', but is '{distribution}'."
+        )
+    rng = np.random.default_rng(seed)
+
+    def kernel(block: np.ndarray) -> np.ndarray:
+        scale = amount * (np.nanmax(block, axis=0) - np.nanmin(block, axis=0))
+        if distribution == "gaussian":
+            noise = rng.standard_normal(size=block.shape)
+        else:
+            noise = rng.uniform(-0.5, 0.5, size=block.shape)
+        noise *= scale
+        block += noise
+        return block
+
+    @elementwise(kernel=kernel, dtype=_to_float)
+    def _range_noise(ts: Timeseries):
+        return apply_fused(ts, [_range_noise])
+
+    return _range_noise
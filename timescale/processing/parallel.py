@@ -0,0 +1,223 @@
+"""
+Parallel scoring of alignment candidates on a process pool.
+The arrays of both series are placed once in :mod:`multiprocessing.shared_memory`,
+the workers attach to them instead of receiving pickled copies.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from timescale.processing.alignment import TransformCache
+from timescale.timeseries import Timeseries
+
+
+@dataclass
+class _SharedArray:
+    # Picklable handle of an array in a shared memory block
+    name: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+    order: str
+
+    def attach(self) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+        shm = shared_memory.SharedMemory(name=self.name)
+        array = np.ndarray(self.shape, self.dtype, buffer=shm.buf, order=self.order)
+        array.flags.writeable = False
+        return shm, array
+
+
+def _share(array: np.ndarray, order: str, blocks: list) -> _SharedArray:
+    if array.dtype.hasobject:
+        raise ValueError(
+            f"Arrays of dtype {array.dtype} can't be placed in shared memory."
+        )
+    # Shared memory blocks must not be empty
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(shm)
+    shared = np.ndarray(array.shape, array.dtype, buffer=shm.buf, order=order)
+    shared[...] = array
+    return _SharedArray(shm.name, array.shape, array.dtype, order)
+
+
+@dataclass
+class _SharedTimeseries:
+    # Picklable description of a `Timeseries` whose arrays live in shared memory
+    time: _SharedArray
+    data: _SharedArray
+    index: _SharedArray | pd.RangeIndex
+    columns: List[str]
+    dtypes: list
+    time_column: str
+
+    @classmethod
+    def create(cls, ts: Timeseries, blocks: list) -> "_SharedTimeseries":
+        index = ts.index
+        if not isinstance(index, pd.RangeIndex):
+            index = _share(index.to_numpy(), "C", blocks)
+        return cls(
+            _share(ts.time_array(), "C", blocks),
+            _share(ts.data_array(), "F", blocks),
+            index,
+            ts.data_columns(),
+            ts.data_dtypes(),
+            ts._time_column,
+        )
+
+    def attach(self, blocks: list) -> Timeseries:
+        shm_time, time = self.time.attach()
+        shm_data, data = self.data.attach()
+        blocks += [shm_time, shm_data]
+        index = self.index
+        if isinstance(index, _SharedArray):
+            shm_index, index = index.attach()
+            blocks.append(shm_index)
+        ts = Timeseries.from_arrays(
+            time, data, self.columns, time_column=self.time_column, index=index
+        )
+        ts.set_data(data, self.dtypes)
+        return ts
+
+
+# State of a worker process, set once by `_init_worker`
+_worker = {}
+
+
+def _init_worker(shared1, shared2, alignerclass, cache_bytes, aligner_kwargs):
+    blocks = []
+    _worker["ts1"] = shared1.attach(blocks)
+    _worker["ts2"] = shared2.attach(blocks)
+    # The series are views of the blocks, which have to stay open as long as the worker lives
+    _worker["blocks"] = blocks
+    _worker["alignerclass"] = alignerclass
+    _worker["aligner_kwargs"] = aligner_kwargs
+    _worker["cache"] = TransformCache(max_bytes=cache_bytes)
+
+
+def _score_chunk(candidates: np.ndarray) -> np.ndarray:
+    return _worker["alignerclass"].score_batch(
+        _worker["ts1"],
+        _worker["ts2"],
+        candidates,
+        _worker["cache"],
+        _worker["aligner_kwargs"],
+    )
+
+
+class ParallelScorer:
+    """Scores alignment candidates of `ts1` and `ts2` on a pool of worker processes.
+
+    The arrays of both series are copied once into shared memory when the scorer is created,
+    every worker attaches to them and keeps its own :class:`TransformCache` across calls.
+    The pool and the shared memory are released by :func:`ParallelScorer.close`, or when leaving a `with` block.
+
+    ---
+    Examples:
+    ```python
+    with ParallelScorer(ts1, ts2, CorrelationAligner, processes=8) as scorer:
+        scores = scorer(candidates)
+    ```
+
+    Parameters
+    ----------
+    alignerclass
+        The aligner, e.g. :class:`timescale.processing.alignment.CorrelationAligner`
+    processes
+        The number of worker processes. Defaults to :func:`os.cpu_count`.
+    cache_bytes
+        The `max_bytes` of the :class:`TransformCache` of each worker.
+    aligner_kwargs
+        Keyword arguments of the aligners besides the series, e.g. `{"band": 5}` for :class:`DTWAligner`.
+        They are pickled once for each worker.
+    """
+
+    def __init__(
+        self,
+        ts1: Timeseries,
+        ts2: Timeseries,
+        alignerclass,
+        processes: int | None = None,
+        cache_bytes: int = 256 * 2**20,
+        aligner_kwargs: dict | None = None,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self._ts2_length = len(ts2)
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._pool = None
+        try:
+            shared1 = _SharedTimeseries.create(ts1, self._blocks)
+            shared2 = _SharedTimeseries.create(ts2, self._blocks)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(shared1, shared2, alignerclass, cache_bytes, aligner_kwargs),
+            )
+        except BaseException:
+            self.close()
+            raise
+
+    def __call__(self, candidates, chunks_per_process: int = 4) -> np.ndarray:
+        """Returns the `alignment_score` of each candidate, like :func:`BaseAligner.score_batch`.
+
+        Parameters
+        ----------
+        candidates
+            Array of shape `(k, 2)` with one `(translation, scale)` pair per row.
+        chunks_per_process
+            The candidates are split into this many chunks per process to balance the load.
+        """
+        if self._pool is None:
+            raise RuntimeError("The `ParallelScorer` is closed.")
+        candidates = np.asarray(candidates, dtype=np.float64).reshape(-1, 2)
+        scores = np.empty(len(candidates))
+        if len(candidates) == 0:
+            return scores
+        # Chunks of neighbouring scaled lengths let the workers reuse their cached transforms
+        lengths = np.array(
+            [int(self._ts2_length * scale) for scale in candidates[:, 1]]
+        )
+        order = np.argsort(lengths, kind="stable")
+        n_chunks = min(len(candidates), self.processes * chunks_per_process)
+        chunks = np.array_split(order, n_chunks)
+        results = self._pool.map(_score_chunk, [candidates[c] for c in chunks])
+        for chunk, result in zip(chunks, results):
+            scores[chunk] = result
+        return scores
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_parallel(
+    ts1: Timeseries,
+    ts2: Timeseries,
+    alignerclass,
+    candidates,
+    processes: int | None = None,
+    aligner_kwargs: dict | None = None,
+) -> np.ndarray:
+    """Scores `candidates` once with a temporary :class:`ParallelScorer`.
+    Use a :class:`ParallelScorer` directly to score several batches without restarting the pool.
+    """
+    with ParallelScorer(
+        ts1, ts2, alignerclass, processes, aligner_kwargs=aligner_kwargs
+    ) as scorer:
+        return scorer(candidates)
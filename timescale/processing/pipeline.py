@@ -1,15 +1,143 @@
 from __future__ import annotations
-import copy
-from typing import Callable, Iterable, List
+import bisect
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List
 import pandas as pd
 
 from timescale.timeseries import Timeseries
+from timescale.processing import resampling
+from timescale.processing.segments import FEATURES, Segments
 import numpy as np
 
 
+@dataclass
+class StageReport:
+    """Measurements of one stage of a profiled run of a `Pipeline`, see :func:`Pipeline.profile`.
+    Fused element-wise stages are measured together, their names are joined with `+`.
+    """
+
+    stage: str
+    seconds: float
+    rows_in: int
+    rows_out: int
+    # Net and peak memory allocated during the stage, `None` without tracemalloc
+    allocated_bytes: int | None
+    peak_bytes: int | None
+    # Whether the result holds buffers, which are not shared with the input of the stage
+    copied: bool
+    copied_bytes: int
+
+
+class _Profiler:
+    def __init__(self, sink, trace_memory):
+        self.sink = sink
+        self.trace_memory = trace_memory
+
+    def start(self):
+        self.report: List[StageReport] = []
+        # Only stop tracing afterwards if it was started here
+        self.started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def stop(self) -> List[StageReport]:
+        if self.started_tracing:
+            tracemalloc.stop()
+        return self.report
+
+    def run(self, name: str, f, ts: Timeseries) -> Timeseries:
+        rows_in = len(ts)
+        buffers = ts._buffers()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        ts = f(ts)
+        seconds = time.perf_counter() - start
+        allocated = peak = None
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated, peak = current - before, peak - before
+        result = ts._buffers()
+        copied_bytes = sum(
+            buffer.nbytes
+            for buffer, shared in zip(result, _overlapping(result, buffers))
+            if not shared
+        )
+        stage = StageReport(
+            stage=name,
+            seconds=seconds,
+            rows_in=rows_in,
+            rows_out=len(ts),
+            allocated_bytes=allocated,
+            peak_bytes=peak,
+            copied=copied_bytes > 0,
+            copied_bytes=copied_bytes,
+        )
+        self.report.append(stage)
+        if self.sink is not None:
+            self.sink(stage)
+        return ts
+
+
+def _overlapping(buffers: list, others: list) -> List[bool]:
+    # Whether each of `buffers` may share memory with any of `others`, like `np.may_share_memory`
+    # the memory bounds are compared, but in O((n + m) log m) instead of comparing all pairs
+    bounds = sorted(np.byte_bounds(o) for o in others if o.nbytes > 0)
+    starts = [low for low, _ in bounds]
+    # The largest end of all bounds up to each position
+    ends = list(np.maximum.accumulate([high for _, high in bounds]))
+    overlapping = []
+    for buffer in buffers:
+        if buffer.nbytes == 0:
+            overlapping.append(False)
+            continue
+        low, high = np.byte_bounds(buffer)
+        i = bisect.bisect_left(starts, high)
+        overlapping.append(i > 0 and ends[i - 1] > low)
+    return overlapping
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _guarded_copy(ts: Timeseries) -> Timeseries:
+    # A shallow copy, whose buffers are read-only views of the buffers of `ts`.
+    # Stages replacing columns work as usual, stages writing into the shared buffers raise instead of modifying `ts`.
+    ts = ts.copy(deep=False)
+    if ts._frame is None:
+        ts._time, ts._data = _read_only(ts._time), _read_only(ts._data)
+        return ts
+    frame = ts._frame
+    columns = {}
+    for i in range(frame.shape[1]):
+        column = frame.iloc[:, i]
+        # Extension arrays can't be made read-only, so they are copied
+        columns[i] = (
+            _read_only(column.to_numpy())
+            if isinstance(column.dtype, np.dtype)
+            else column.copy()
+        )
+    guarded = pd.DataFrame(columns, index=frame.index, copy=False)
+    guarded.columns = frame.columns
+    ts._frame = guarded
+    return ts
+
+
 class Pipeline:
     def __init__(self):
         self.fs: List[Callable[[Timeseries], Timeseries]] = []
+        # Bytes of the last result which are not shared with the input of `apply`
+        self.copied_bytes: int | None = None
+        # Per stage measurements of the last `apply`, if profiling is enabled
+        self.report: List[StageReport] | None = None
+        self._profiler: _Profiler | None = None
 
     def push(self, f: Callable[[Timeseries], Timeseries]) -> Pipeline:
         self.fs.append(f)
@@ -20,19 +148,164 @@ class Pipeline:
             self = self.push(f)
         return self
 
-    def apply(self, ts: Timeseries, inplace=False):
-        if not inplace:
-            ts = copy.deepcopy(ts)
-        for f in self.fs:
-            ts = f(ts)
+    def profile(
+        self,
+        enabled=True,
+        sink: Callable[[StageReport], None] | None = None,
+        trace_memory=True,
+    ) -> Pipeline:
+        """Enables or disables the instrumentation of the stages in :func:`Pipeline.apply`.
+        After each profiled run `self.report` holds one :class:`StageReport` per stage.
+        Without profiling the stages are called directly.
+
+        Parameters
+        ----------
+        sink
+            Called with the :class:`StageReport` of every stage as soon as it finished,
+            e.g. to forward the measurements to a metrics system.
+        trace_memory
+            Measure the memory allocated by each stage with :mod:`tracemalloc`.
+            Tracing slows down allocations, so the wall times are higher than without it.
+        """
+        self._profiler = _Profiler(sink, trace_memory) if enabled else None
+        return self
+
+    def apply(self, ts: Timeseries, inplace=False, copy_on_write=False):
+        """Applies all stages of the pipeline to `ts`.
+
+        Parameters
+        ----------
+        ts
+            The input `Timeseries`
+        inplace
+            If `True`, the stages are allowed to modify `ts`.
+        copy_on_write
+            If `True` and not `inplace`, the stages work on a shallow copy of `ts`,
+            whose buffers are read-only views of the buffers of `ts`.
+            Only the columns replaced by a stage are new, the others stay shared with `ts` and read-only,
+            so the result never shares writable memory with `ts`.
+            Stages have to replace columns, writing into a shared column raises a `ValueError`.
+
+        After the run `self.copied_bytes` holds the amount of bytes of the result,
+        which are not shared with `ts`. See :func:`Pipeline.profile` for measurements of each stage.
+        """
+        profiler = self._profiler
+        original = ts._buffers()
+        if profiler is not None:
+            profiler.start()
+        try:
+            if inplace:
+                ts = self._run(ts)
+            elif copy_on_write:
+                ts = self._run(_guarded_copy(ts))
+            else:
+                ts = self._run(ts.copy())
+        finally:
+            if profiler is not None:
+                self.report = profiler.stop()
+        result = ts._buffers()
+        self.copied_bytes = sum(
+            buffer.nbytes
+            for buffer, shared in zip(result, _overlapping(result, original))
+            if not shared
+        )
         return ts
 
+    def _run(self, ts: Timeseries) -> Timeseries:
+        # Consecutive element-wise stages are executed as one pass over the data columns,
+        # they never write into the buffers of their input, see `apply_fused`
+        profiler = self._profiler
+        i = 0
+        while i < len(self.fs):
+            j = i
+            while j < len(self.fs) and hasattr(self.fs[j], "kernel"):
+                j += 1
+            if j - i > 1 and _is_fusable(ts):
+                fs = self.fs[i:j]
+                if profiler is None:
+                    ts = apply_fused(ts, fs)
+                else:
+                    name = "+".join(f.__name__ for f in fs)
+                    ts = profiler.run(name, lambda ts: apply_fused(ts, fs), ts)
+                i = j
+            else:
+                f = self.fs[i]
+                if profiler is None:
+                    ts = f(ts)
+                else:
+                    ts = profiler.run(f.__name__, f, ts)
+                i += 1
+        return ts
+
+    def apply_stream(self, chunks: Iterable[Timeseries]) -> Iterator[Timeseries]:
+        """Applies the pipeline to consecutive chunks of one `Timeseries` and yields the transformed chunks.
+        Stages keep their state (e.g. a moving window) across chunk boundaries,
+        such that the concatenated output matches the output of :func:`Pipeline.apply`.
+        Only stages marked with :func:`streamable` are supported.
+
+        Parameters
+        ----------
+        chunks
+            The chunks in ascending time order, e.g. from :func:`timescale.io.iter_parquet_row_groups`.
+            They are modified in place.
+        """
+        step = self.stream()
+        for ts in chunks:
+            yield step(ts)
+
+    def stream(self) -> Callable[[Timeseries], Timeseries]:
+        """Returns a function, which applies the pipeline to the next chunk of one `Timeseries`.
+        Each call costs O(rows of the chunk), the state of the stages is carried from one call to the next.
+        This is meant for live data, e.g. together with :func:`Timeseries.append`:
+
+        ---
+        Examples:
+        ```python
+        step = Pipeline().push(smoothing_exponential()).stream()
+        # for every batch of new rows:
+        chunk = step(Timeseries.from_arrays(time, data))
+        smoothed.append(chunk.time_array(), chunk.data_array())
+        ```
+
+        See :func:`Pipeline.apply_stream`.
+        """
+        for f in self.fs:
+            if not hasattr(f, "stream"):
+                raise ValueError(
+                    f"Stage '{f.__name__}' can not be applied to chunks of a `Timeseries`."
+                )
+        fs = [f.stream() for f in self.fs]
+
+        def step(ts: Timeseries) -> Timeseries:
+            for f in fs:
+                ts = f(ts)
+            return ts
+
+        return step
+
+    def apply_parquet(
+        self,
+        source: str | os.PathLike,
+        target: str | os.PathLike,
+        time_column: str | int | None = None,
+    ):
+        """Applies the pipeline to a parquet file row group by row group and writes the result to `target`.
+        Peak memory is bounded by the size of a row group, see :func:`Pipeline.apply_stream`.
+        This function requires pyarrow to be installed.
+        """
+        import timescale.io as tio
+
+        chunks = tio.iter_parquet_row_groups(source, time_column)
+        tio.write_parquet_stream(self.apply_stream(chunks), target)
+
     def __repr__(self) -> str:
         fs = "[" + " | ".join([f.__name__ for f in self.fs]) + "]"
         return "Pipeline: " + fs
 
-    def __call__(self, ts: Timeseries, inplace=False) -> Timeseries:
-        return self.apply(ts, inplace=inplace)
+    def __call__(
+        self, ts: Timeseries, inplace=False, copy_on_write=False
+    ) -> Timeseries:
+        return self.apply(ts, inplace=inplace, copy_on_write=copy_on_write)
 
     def pop(self):
         self.fs.pop()
@@ -41,10 +314,13 @@ class Pipeline:
         pipeline = Pipeline()
         for f in self.fs:
             pipeline.push(f)
+        pipeline._profiler = self._profiler
         return pipeline
 
-    def interpolate(self, new_count: int) -> Pipeline:
-        return self.push(interpolate_count(new_count))
+    def interpolate(
+        self, new_count: int, kernel="linear", aggregation=None
+    ) -> Pipeline:
+        return self.push(interpolate_count(new_count, kernel, aggregation))
 
     def index_to_time(self) -> Pipeline:
         return self.push(index_to_time)
@@ -56,48 +332,115 @@ class Pipeline:
         return self.push(cut_front(amount, reindex))
 
 
-def interpolate_count(n):
+def elementwise(kernel, dtype):
+    """Marks a stage as element-wise, such that the `Pipeline` can fuse it with neighbouring element-wise stages.
+
+    Parameters
+    ----------
+    kernel
+        Takes a 2-D float block of all data columns (one column per channel) and returns the transformed block.
+        The block is owned by the pipeline and may be modified in place.
+    dtype
+        Maps the dtype of a data column before the stage to its dtype after the stage.
+    """
+
+    def decorate(f):
+        f.kernel = kernel
+        f.kernel_dtype = dtype
+        return f
+
+    return decorate
+
+
+def streamable(stream=None):
+    """Marks a stage as applicable to consecutive chunks of a `Timeseries`, see :func:`Pipeline.apply_stream`.
+
+    Parameters
+    ----------
+    stream
+        Returns a new stage, which carries the state of the stage from one chunk to the next.
+        Can be omitted if the stage only depends on the rows of the current chunk.
+    """
+
+    def decorate(f):
+        f.stream = stream if stream is not None else lambda: f
+        return f
+
+    return decorate
+
+
+def _is_fusable(ts: Timeseries) -> bool:
+    dtypes = ts.data_dtypes()
+    return len(dtypes) > 0 and all(
+        np.issubdtype(d, np.integer) or np.issubdtype(d, np.floating) for d in dtypes
+    )
+
+
+def apply_fused(ts: Timeseries, fs) -> Timeseries:
+    """Applies the kernels of the :func:`elementwise` stages `fs` to the data columns of `ts` in one pass.
+    An element-wise stage applied on its own calls this with itself, e.g. `return apply_fused(ts, [stage])`.
+    """
+    dtypes = ts.data_dtypes()
+    block = ts.data_array()
+    # An array backed `Timeseries` may share its data with other `Timeseries`
+    if ts.is_array_backed():
+        block = block.copy(order="F")
+    for f in fs:
+        block = f.kernel(block)
+        dtypes = [f.kernel_dtype(d) for d in dtypes]
+    ts.set_data(block, dtypes)
+    return ts
+
+
+def interpolate_count(n, kernel="linear", aggregation=None):
     """Interpolates all data points such that the timeseries has `n` elements.
     If the `Timerseries` has 10 datapoints and factor=1.5, then the returned timeseries will have 15 datapoints.
     The amount will be rounded to the next integer.
-    Linear interpolation is used.
+    The new time points are evenly spaced between the first and the last time point,
+    the old ones don't have to be. All channels are resampled at once, see :mod:`timescale.processing.resampling`.
+
+    Parameters
+    ----------
+    kernel
+        `"linear"` interpolation, the `"nearest"` data point or `"zero-order-hold"` (the last data point).
+    aggregation
+        When downsampling, reduce all data points closest to a new time point with `"mean"`, `"min"` or `"max"`
+        instead of interpolating at the new time point.
     """
     assert n > 0
 
     def _interpolate_apply(ts: Timeseries):
-        df = ts.df
-        x2_old = [x for x in ts.time_column()]
+        x2_old = ts.time_array()
         # The x axis should be in the same interval than before
         x2 = np.linspace(x2_old[0], x2_old[-1], num=n)
-        # We need to first calculate all interpolation before reindexing because weird sideeffects might occur if the df was indexed weirdly before
-        interp = {}
-        for c in df:
-            interp[c] = np.interp(x2, x2_old, df[c])
-        df = df.reindex(range(len(x2)))
-        for c in df:
-            df[c] = interp[c]
-        ts.df = df
+        data = ts.data_array()
+        if aggregation is not None and n < len(ts):
+            interp = resampling.aggregate(x2_old, data, x2, aggregation, kernel)
+        else:
+            interp = resampling.resample(x2_old, data, x2, kernel)
+        ts.set_arrays(x2, interp)
         return ts
 
     return _interpolate_apply
 
 
-def interpolate_factor(factor):
+def interpolate_factor(factor, kernel="linear", aggregation=None):
     """Interpolates all data points by a given factor.
     If the `Timerseries` has 10 datapoints and factor=1.5, then the returned timeseries will have 15 datapoints.
     The amount will be rounded to the next integer.
-    Linear interpolation is used.
+    See :func:`interpolate_count` for the `kernel` and the `aggregation`.
     """
 
     def _interpolate_apply(ts: Timeseries):
         # number of elements in each column after interpolating
-        num = int(len(ts.df) * factor)
-        interp = interpolate_count(n=num)
+        num = int(len(ts) * factor)
+        interp = interpolate_count(n=num, kernel=kernel, aggregation=aggregation)
         return interp(ts)
 
     return _interpolate_apply
 
 
+@streamable()
 def index_to_time(ts: Timeseries):
     """Overrides the `time_column` of the `Timeseries` with the current index of the `DataFrame`.
 
@@ -112,15 +455,18 @@ def index_to_time(ts: Timeseries):
     assert all(ts.time_column() == [2, 3, 4])
     ```
     """
-    ts.df[ts._time_column] = [x for x in ts.df.index]
+    ts.set_time(ts.index.to_numpy())
     return ts
 
 
 def cut_front(n=1, reindex=True):
     def cut_front_inner(ts: Timeseries) -> Timeseries:
-        ts.df = pd.DataFrame(ts.df[n:].dropna(axis="rows"))
+        time, data = ts.time_array()[n:], ts.data_array()[n:]
+        keep = ~(pd.isna(time) | np.isnan(data).any(axis=1))
+        index = ts.index[n:][keep]
         if reindex:
-            ts.df.index = ts.df.index - n
+            index = index - n
+        ts.set_arrays(time[keep], data[keep], index=index, dtypes=ts.data_dtypes())
         return ts
 
     return cut_front_inner
@@ -131,12 +477,13 @@ def mult(x=1.0):
     This does not affect the _time_column of the `Timeseries`.
     """
 
+    @streamable()
+    @elementwise(
+        kernel=lambda block: np.multiply(block, x, out=block),
+        dtype=lambda d: np.result_type(d, x),
+    )
     def multiplier(ts: Timeseries):
-        df = ts.data_df()
-        for c in df:
-            r = df[c]
-            ts.df[c] = r * x
-        return ts
+        return apply_fused(ts, [multiplier])
 
     return multiplier
 
@@ -146,12 +493,13 @@ def add(x=1.0):
     This does not affect the _time_column of the `Timeseries`.
     """
 
+    @streamable()
+    @elementwise(
+        kernel=lambda block: np.add(block, x, out=block),
+        dtype=lambda d: np.result_type(d, x),
+    )
     def adder(ts: Timeseries):
-        df = ts.data_df()
-        for c in df:
-            r = df[c]
-            ts.df[c] = r + x
-        return ts
+        return apply_fused(ts, [adder])
 
     return adder
 
@@ -164,16 +512,71 @@ def normalization(min=0.0, max=1.0):
     Normalization does not affect the _time_column of the `Timeseries`
     """
 
+    def kernel(block: np.ndarray) -> np.ndarray:
+        lower = np.nanmin(block, axis=0)
+        upper = np.nanmax(block, axis=0)
+        block -= lower
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block /= upper - lower
+        block *= max - min
+        block += min
+        return block
+
+    @elementwise(kernel=kernel, dtype=lambda d: np.dtype(np.float64))
     def normalize(ts: Timeseries):
-        df = ts.data_df()
-        for c in df:
-            x = df[c]
-            ts.df[c] = ((x - np.min(x)) / (np.max(x) - np.min(x))) * (max - min) + min
-        return ts
+        return apply_fused(ts, [normalize])
 
     return normalize
 
 
+def online_normalization(min=0.0, max=1.0):
+    """Normalizes each row with the minimum and maximum of each data column up to and including this row.
+    Unlike :func:`normalization` earlier rows don't depend on later ones,
+    so the stage can be applied to the rows of a live `Timeseries` as they arrive, see :func:`Pipeline.stream`.
+    Columns are constant (NaN) until they have two different values.
+    """
+
+    def normalize_block(block: np.ndarray, lower: np.ndarray, upper: np.ndarray):
+        block -= lower
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block /= upper - lower
+        block *= max - min
+        block += min
+        return block
+
+    def kernel(block: np.ndarray) -> np.ndarray:
+        lower = np.fmin.accumulate(block, axis=0)
+        upper = np.fmax.accumulate(block, axis=0)
+        return normalize_block(block, lower, upper)
+
+    def _stream():
+        # The running minimum and maximum of the previous chunks
+        lower = upper = None
+
+        def _normalize_chunk(ts: Timeseries):
+            nonlocal lower, upper
+            block = ts.data_array().copy(order="F")
+            if len(block) == 0:
+                return ts
+            block_lower = np.fmin.accumulate(block, axis=0)
+            block_upper = np.fmax.accumulate(block, axis=0)
+            if lower is not None:
+                np.fmin(block_lower, lower, out=block_lower)
+                np.fmax(block_upper, upper, out=block_upper)
+            lower, upper = block_lower[-1].copy(), block_upper[-1].copy()
+            ts.set_data(normalize_block(block, block_lower, block_upper))
+            return ts
+
+        return _normalize_chunk
+
+    @streamable(_stream)
+    @elementwise(kernel=kernel, dtype=lambda d: np.dtype(np.float64))
+    def online_normalize(ts: Timeseries):
+        return apply_fused(ts, [online_normalize])
+
+    return online_normalize
+
+
 def outlier_removal(ts: Timeseries):
     pass
 
@@ -181,11 +584,26 @@ def outlier_removal(ts: Timeseries):
 def smoothing_basic(n=1):
     """Smoothes the `Timeseries` using the moving average"""
 
+    def _stream():
+        # The last `n - 1` rows of the previous chunks
+        tail = None
+
+        def _smoothing_chunk(ts: Timeseries):
+            nonlocal tail
+            data = ts.data_array()
+            block = data if tail is None else np.concatenate([tail, data])
+            df = pd.DataFrame(block, copy=False)
+            smoothed = df.rolling(window=n).mean().to_numpy()
+            ts.set_data(smoothed[len(block) - len(data) :])
+            tail = block[max(len(block) - (n - 1), 0) :].copy()
+            return ts
+
+        return _smoothing_chunk
+
+    @streamable(_stream)
     def _smoothing(ts: Timeseries):
-        df = ts.data_df()
-        for c in df:
-            x = df[c]
-            ts.df[c] = x.rolling(window=n).mean()
+        df = pd.DataFrame(ts.data_array(), copy=False)
+        ts.set_data(df.rolling(window=n).mean().to_numpy())
         return ts
 
     return _smoothing
@@ -194,13 +612,29 @@ def smoothing_basic(n=1):
 def smoothing_exponential():
     """Smoothes the `Timeseries` using the exponential moving average"""
 
+    def _stream():
+        # The last smoothed row of the previous chunks
+        last = None
+
+        def _smoothing_chunk(ts: Timeseries):
+            nonlocal last
+            data = ts.data_array()
+            # Without adjustment the average of the first row is the row itself,
+            # so prepending the last average continues the average of the previous chunk.
+            block = data if last is None else np.concatenate([last, data])
+            df = pd.DataFrame(block, copy=False)
+            smoothed = df.ewm(com=0.5, adjust=False).mean().to_numpy()
+            ts.set_data(smoothed[len(block) - len(data) :])
+            if len(smoothed) > 0:
+                last = smoothed[-1:].copy()
+            return ts
+
+        return _smoothing_chunk
+
+    @streamable(_stream)
     def _smoothing(ts: Timeseries):
-        df = ts.data_df()
-
-        length = len(ts.time_column())
-        alpha = 2.0 / (length - 1)
-        for c in df:
-            ts.df[c] = df[c].ewm(com=0.5, adjust=False).mean()
+        df = pd.DataFrame(ts.data_array(), copy=False)
+        ts.set_data(df.ewm(com=0.5, adjust=False).mean().to_numpy())
         return ts
 
     return _smoothing
@@ -210,8 +644,38 @@ def sampling(ts: Timeseries):
     pass
 
 
-def segmentation(ts: Timeseries):
-    pass
+def segmentation(length, stride=None, padding="none", features=("mean",)):
+    """Replaces the `Timeseries` by one row per window of `length` data points, which holds the `features` of the window.
+    The windows are views of the data and all windows are reduced at once, see :class:`timescale.processing.segments.Segments`.
+    Each row has the time of the first data point of its window, the data columns are named `<column>-<feature>`.
+
+    Parameters
+    ----------
+    stride
+        The number of data points between the starts of two windows. Defaults to `length`.
+    padding
+        `"none"` drops the last data points, which don't fill a whole window,
+        `"nan"`, `"zero"` or `"edge"` (the last data point) pad the last windows.
+    features
+        Some of `"mean"`, `"energy"`, `"min"`, `"max"` and `"slope"`.
+    """
+    for name in features:
+        if name not in FEATURES:
+            raise ValueError(
+                f"Features should be some of {FEATURES}, but '{name}' isn't."
+            )
+
+    def _segmentation(ts: Timeseries):
+        segments = Segments(ts.data_array(), length, stride, padding)
+        columns = [f"{c}-{f}" for f in features for c in ts.data_columns()]
+        return Timeseries.from_arrays(
+            ts.time_array()[segments.starts()],
+            segments.features(features),
+            columns,
+            time_column=ts._time_column,
+        )
+
+    return _segmentation
 
 
 def power_transform(ts: Timeseries):
@@ -0,0 +1,186 @@
+"""
+Coarse to fine alignment search on a pyramid of downsampled series.
+The whole search space is only scored on the coarsest level,
+finer levels refine the best candidates of the previous level.
+"""
+
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+from timescale.processing.alignment import Alignment, TransformCache
+from timescale.processing.pipeline import Pipeline, interpolate_count, index_to_time
+from timescale.timeseries import Timeseries
+
+
+def build_pyramid(
+    ts: Timeseries, levels: int, factor: int = 4, min_length: int = 64
+) -> List[Timeseries]:
+    """Returns `ts` followed by up to `levels - 1` versions, each downsampled by `factor`
+    with :func:`interpolate_count` averaging the data points closest to each new one.
+    Averaging the blocks instead of sampling single points keeps noise from aliasing into the coarse levels.
+    Levels shorter than `min_length` are omitted.
+    """
+    pyramid = [ts]
+    for level in range(1, levels):
+        n = len(ts) // factor**level
+        if n < min_length:
+            break
+        pipeline = (
+            Pipeline()
+            .push(interpolate_count(n, aggregation="mean"))
+            .push(index_to_time)
+        )
+        pyramid.append(pipeline.apply(pyramid[-1], copy_on_write=True))
+    return pyramid
+
+
+def pyramid_align(
+    ts1: Timeseries,
+    ts2: Timeseries,
+    alignerclass,
+    scale_bounds: Tuple[float, float],
+    translation_bounds: Tuple[float, float] | None = None,
+    levels: int = 4,
+    factor: int = 4,
+    scale_steps: int | None = None,
+    translation_steps: int | None = None,
+    keep: int = 8,
+    scale_tolerance: float | None = None,
+    translation_tolerance: float = 1.0,
+    aligner_kwargs: dict | None = None,
+) -> Tuple[Alignment, float]:
+    """Searches the alignment of `ts1` and `ts2` with the highest score coarse to fine.
+
+    The search space is scored on a regular grid of `scale_steps` x `translation_steps` candidates on the coarsest level.
+    By default the grid is as dense as the coarsest level: neighbouring translations are one sample apart
+    and neighbouring scales change the length of `ts2` by one sample.
+    The peaks of noisy series are too narrow to be found on a sparser grid.
+    Aligners with a `translation_scores` method, like :class:`CorrelationAligner`, score these at once per scale.
+    The best translation of each scale is a candidate.
+    The `keep` best candidates are refined on each finer level by scoring their neighbours at half the previous grid step.
+    Refinement continues on the full resolution until the grid step is below the tolerances.
+    Scores are calculated with :func:`BaseAligner.score_batch`.
+
+    Parameters
+    ----------
+    alignerclass
+        The aligner, e.g. :class:`timescale.processing.alignment.CorrelationAligner`
+    scale_bounds
+        Lower and upper bound of the scale.
+    translation_bounds
+        Lower and upper bound of the translation in time units of the full resolution.
+        Defaults to all translations with an overlap.
+    levels
+        The number of pyramid levels including the full resolution.
+    factor
+        The downsampling factor between two levels.
+    scale_steps
+        The number of scales of the grid on the coarsest level.
+        Defaults to scales, which change the length of `ts2` on the coarsest level by one sample.
+    translation_steps
+        The number of translations of the grid on the coarsest level.
+        Defaults to all translations within the bounds, which are a whole sample of the coarsest level apart.
+    scale_tolerance, translation_tolerance
+        The grid step of the last refinement, i.e. the precision of the result compared to a search on the full resolution.
+        The scale defaults to a change of the length of `ts2` by one sample.
+    aligner_kwargs
+        Keyword arguments of the aligners besides the series, e.g. `{"band": 5}` for :class:`DTWAligner`.
+
+    Returns
+    -------
+    alignment, score
+        The best alignment and its score on the full resolution.
+    """
+    pyramid1 = build_pyramid(ts1, levels, factor)
+    pyramid2 = build_pyramid(ts2, levels, factor)
+    levels = min(len(pyramid1), len(pyramid2))
+    if scale_tolerance is None:
+        scale_tolerance = 1.0 / len(ts2)
+    if translation_bounds is None:
+        translation_bounds = (-len(ts2) * scale_bounds[1], len(ts1))
+    # Time units of the full resolution per time unit of each level
+    ratios = [len(ts1) / len(ts) for ts in pyramid1[:levels]]
+    caches = [TransformCache() for _ in range(levels)]
+
+    def score(level: int, candidates: np.ndarray) -> np.ndarray:
+        candidates = candidates.copy()
+        candidates[:, 0] /= ratios[level]
+        return alignerclass.score_batch(
+            pyramid1[level], pyramid2[level], candidates, caches[level], aligner_kwargs
+        )
+
+    level = levels - 1
+    if scale_steps is None:
+        # Neighbouring scales change the length of ts2 on the coarsest level by about one sample
+        scale_steps = (
+            int(np.ceil((scale_bounds[1] - scale_bounds[0]) * len(pyramid2[level]))) + 1
+        )
+    scales, scale_step = np.linspace(*scale_bounds, max(scale_steps, 2), retstep=True)
+    if translation_steps is None:
+        translation_step = ratios[level]
+        first = np.ceil(translation_bounds[0] / translation_step)
+        last = max(np.floor(translation_bounds[1] / translation_step), first)
+        translations = np.arange(first, last + 1) * translation_step
+    else:
+        translations, translation_step = np.linspace(
+            *translation_bounds, translation_steps, retstep=True
+        )
+    if translation_steps is None and hasattr(alignerclass, "translation_scores"):
+        scores = np.stack(
+            [
+                _dense_scores(
+                    alignerclass(
+                        pyramid1[level],
+                        pyramid2[level],
+                        transform_cache=caches[level],
+                        **(aligner_kwargs or {}),
+                    ),
+                    scale,
+                    translations / ratios[level],
+                )
+                for scale in scales
+            ]
+        )
+    else:
+        grid = np.stack(np.meshgrid(translations, scales), axis=-1).reshape(-1, 2)
+        scores = score(level, grid).reshape(len(scales), len(translations))
+    # The best translation of each scale, a dense grid would otherwise only keep the neighbours of one peak
+    columns = np.argmax(scores, axis=1)
+    scores = scores[np.arange(len(scales)), columns]
+    order = np.argsort(scores)[::-1][:keep]
+    best = np.stack([translations[columns[order]], scales[order]], axis=-1)
+
+    offsets = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1]), axis=-1).reshape(-1, 2)
+    while (
+        level > 0
+        or scale_step > scale_tolerance
+        or translation_step > translation_tolerance
+    ):
+        level = max(level - 1, 0)
+        # Halving stops at the tolerance, but a grid, which is already finer, isn't coarsened
+        scale_step = min(scale_step, max(scale_step / 2.0, scale_tolerance))
+        translation_step = min(
+            translation_step, max(translation_step / 2.0, translation_tolerance)
+        )
+        steps = np.array([translation_step, scale_step])
+        candidates = (best[:, None, :] + offsets[None, :, :] * steps).reshape(-1, 2)
+        candidates[:, 1] = np.clip(candidates[:, 1], *scale_bounds)
+        candidates[:, 0] = np.clip(candidates[:, 0], *translation_bounds)
+        candidates = np.unique(candidates, axis=0)
+        scores = score(level, candidates)
+        best = candidates[np.argsort(scores)[::-1][:keep]]
+
+    translation, scale = best[0]
+    return Alignment(float(scale), float(translation)), float(np.max(scores))
+
+
+def _dense_scores(aligner, scale: float, translations: np.ndarray) -> np.ndarray:
+    # The scores of the integer `translations` at `scale` from the scores of all translations with an overlap
+    all_translations, all_scores = aligner.translation_scores(scale)
+    positions = np.round(translations).astype(np.int64) - all_translations[0]
+    inside = (positions >= 0) & (positions < len(all_scores))
+    scores = np.full(len(translations), -np.inf)
+    scores[inside] = all_scores[positions[inside]]
+    return scores
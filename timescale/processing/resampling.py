@@ -0,0 +1,99 @@
+"""
+Resampling of all channels of a series onto a new time grid at once.
+The input times have to be sorted, but don't have to be uniform.
+"""
+
+import numpy as np
+
+KERNELS = ("linear", "nearest", "zero-order-hold")
+AGGREGATIONS = ("mean", "min", "max")
+
+
+def resample(
+    time: np.ndarray, data: np.ndarray, grid: np.ndarray, kernel: str = "linear"
+) -> np.ndarray:
+    """Interpolates the rows of `data` at the times `grid`.
+    Times outside of `time` get the first or the last row.
+
+    Parameters
+    ----------
+    time
+        1-D array of the sorted input times.
+    data
+        2-D array with one row per input time and one column per channel.
+    grid
+        1-D array of the target times.
+    kernel
+        `"linear"` interpolation between the neighbouring rows, the `"nearest"` row
+        or `"zero-order-hold"`, i.e. the last row at or before the target time.
+
+    Returns
+    -------
+    2-D Fortran ordered float array with one row per target time.
+    """
+    if kernel not in KERNELS:
+        raise ValueError(
+            f"Argument `kernel` should be one of {KERNELS}, but is '{kernel}'."
+        )
+    time = np.asarray(time, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+    n = len(time)
+    assert n > 0, "can't resample an empty series"
+    out = np.empty((len(grid), data.shape[1]), order="F")
+    if kernel == "linear":
+        # `np.interp` exploits the sorted target times and is faster than gathering both neighbours of all channels
+        for i in range(data.shape[1]):
+            out[:, i] = np.interp(grid, time, data[:, i])
+        return out
+    # The last row at or before each target time
+    rows = np.clip(np.searchsorted(time, grid, side="right") - 1, 0, n - 1)
+    if kernel == "nearest" and n > 1:
+        right = np.minimum(rows + 1, n - 1)
+        # Ties go to the earlier row
+        rows = np.where(time[right] - grid < grid - time[rows], right, rows)
+    # The rows are shared by all channels, gathering column by column is faster on Fortran ordered blocks
+    for i in range(data.shape[1]):
+        out[:, i] = data[:, i][rows]
+    return out
+
+
+def aggregate(
+    time: np.ndarray,
+    data: np.ndarray,
+    grid: np.ndarray,
+    how: str = "mean",
+    kernel: str = "linear",
+) -> np.ndarray:
+    """Reduces the rows of `data` to one row per target time of the sorted `grid`.
+    Each target time stands for all input rows, which are closer to it than to its neighbours.
+    Target times without any input row are interpolated with `kernel`, see :func:`resample`.
+
+    Parameters
+    ----------
+    how
+        The reduction of the rows of each target time: `"mean"`, `"min"` or `"max"`.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(
+            f"Argument `how` should be one of {AGGREGATIONS}, but is '{how}'."
+        )
+    time = np.asarray(time, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+    edges = (grid[1:] + grid[:-1]) / 2.0
+    # The rows of each target time are contiguous, `starts[k]` is the first row of target `k`
+    starts = np.searchsorted(time, edges, side="left")
+    starts = np.concatenate([[0], starts])
+    counts = np.diff(np.append(starts, len(time)))
+    filled = counts > 0
+    out = np.empty((len(grid), data.shape[1]), order="F")
+    if not np.all(filled):
+        out[~filled] = resample(time, data, grid[~filled], kernel)
+    # `reduceat` takes the element at the start for empty segments, so only non empty ones are reduced
+    starts = starts[filled]
+    reduce = {"mean": np.add, "min": np.minimum, "max": np.maximum}[how]
+    for i in range(data.shape[1]):
+        reduced = reduce.reduceat(np.asarray(data[:, i], dtype=np.float64), starts)
+        if how == "mean":
+            reduced /= counts[filled]
+        out[filled, i] = reduced
+    return out
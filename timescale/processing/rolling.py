@@ -0,0 +1,326 @@
+"""
+Rolling window statistics of all channels of a series at once.
+The functions take a 2-D block with one column per channel and return a Fortran ordered block of the same shape,
+in which row `i` holds the statistic of the rows `i - window + 1` up to `i`.
+Like :meth:`pandas.DataFrame.rolling` with the default `min_periods`,
+the first `window - 1` rows and all windows containing NaN are NaN.
+
+The channels are processed together on a channel-major copy of the block, which is free for the Fortran ordered
+blocks of :class:`Timeseries`. Minimum and maximum use one comparison pass per row of short windows and
+the van Herk/Gil-Werman block scheme for long ones, which needs three comparisons per element independent of
+the window length (the vectorized counterpart of a monotonic deque). Means use running sums,
+which restart every few hundred rows to bound their rounding errors. Variances sum each window from two running
+sums, which only contain rows of the window centered by one of them, so they don't cancel after a level shift. Medians and quantiles partition
+short windows, long windows use the skip list of pandas, which is compiled and beats any numpy formulation.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from timescale.processing.pipeline import streamable
+from timescale.timeseries import Timeseries
+
+# Windows up to this length are reduced by comparing shifted copies, longer ones with van Herk/Gil-Werman
+_SHIFTED_EXTREMUM_MAX_WINDOW = 32
+# Windows up to this length are partitioned for quantiles, longer ones use the skip list of pandas
+_PARTITION_QUANTILE_MAX_WINDOW = 16
+# Upper bound of the number of elements of the windows copied at once for quantiles
+_QUANTILE_CHUNK_ELEMENTS = 2**22
+# Running sums restart after at least this many rows
+_SUM_BLOCK = 256
+
+
+def _channels(data) -> np.ndarray:
+    # One row per channel, a view of Fortran ordered blocks
+    data = np.asarray(data, dtype=np.float64)
+    assert data.ndim == 2, "expected one column per channel"
+    return np.ascontiguousarray(data.T)
+
+
+def _empty(x: np.ndarray) -> np.ndarray:
+    return np.full(x.shape, np.nan)
+
+
+def _mask_nan_windows(out: np.ndarray, x: np.ndarray, window: int) -> np.ndarray:
+    # Sets the windows containing NaN to NaN, the rows of `out` and `x` are channels
+    nan = np.isnan(x)
+    if not nan.any():
+        return out
+    counts = np.zeros((x.shape[0], x.shape[1] + 1), dtype=np.int64)
+    np.cumsum(nan, axis=1, out=counts[:, 1:])
+    out[:, window - 1 :][
+        counts[:, window:] != counts[:, : x.shape[1] - window + 1]
+    ] = np.nan
+    return out
+
+
+def _extremum(data, window: int, ufunc, fill: float) -> np.ndarray:
+    # `ufunc` propagates NaN, the NaN of a window always ends up in its result
+    x = _channels(data)
+    k, n = x.shape
+    out = _empty(x)
+    if window > n:
+        return out.T
+    if window <= _SHIFTED_EXTREMUM_MAX_WINDOW:
+        valid = out[:, window - 1 :]
+        valid[...] = x[:, window - 1 :]
+        for shift in range(1, window):
+            ufunc(valid, x[:, window - 1 - shift : n - shift], out=valid)
+        return out.T
+    # van Herk/Gil-Werman: the rows are split into blocks of `window` rows,
+    # each window is the suffix of one block and the prefix of the next one
+    blocks = -(-n // window)
+    padded = np.full((k, blocks * window), fill)
+    padded[:, :n] = x
+    padded = padded.reshape(k, blocks, window)
+    prefix = ufunc.accumulate(padded, axis=2).reshape(k, -1)
+    suffix = ufunc.accumulate(padded[:, :, ::-1], axis=2)[:, :, ::-1].reshape(k, -1)
+    ufunc(
+        suffix[:, : n - window + 1], prefix[:, window - 1 : n], out=out[:, window - 1 :]
+    )
+    return out.T
+
+
+def window_min(data: np.ndarray, window: int) -> np.ndarray:
+    """The minimum of each window."""
+    return _extremum(data, window, np.minimum, np.inf)
+
+
+def window_max(data: np.ndarray, window: int) -> np.ndarray:
+    """The maximum of each window."""
+    return _extremum(data, window, np.maximum, -np.inf)
+
+
+def _window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    # Sums of the windows of the channels `x` without NaN, the first `window - 1` rows are NaN.
+    # The running sums restart at the start of each block of `size >= window` rows,
+    # so their rounding errors don't grow with the length of the series like those of a global running sum.
+    # A window ending at `e` sums the block up to `e` and, if it starts in the previous block,
+    # the suffix of the previous block from its start `s`.
+    k, n = x.shape
+    size = max(window, _SUM_BLOCK)
+    blocks = -(-n // size)
+    prefix = np.empty((k, blocks, size))
+    flat = prefix.reshape(k, -1)
+    flat[:, :n] = x
+    flat[:, n:] = 0.0
+    np.cumsum(prefix, axis=2, out=prefix)
+    # The correction of the window starting at each row: minus the sum of its block before this row,
+    # plus the sum of the whole block if the window ends in the next block
+    start = np.empty_like(prefix)
+    start[:, :, 0] = 0.0
+    np.negative(prefix[:, :, :-1], out=start[:, :, 1:])
+    start[:, :, size - window + 1 :] += prefix[:, :, -1:]
+    out = np.empty(x.shape)
+    out[:, : window - 1] = np.nan
+    np.add(
+        flat[:, window - 1 : n],
+        start.reshape(k, -1)[:, : n - window + 1],
+        out=out[:, window - 1 :],
+    )
+    return out
+
+
+def _centered(data):
+    # Running sums lose precision with a large offset, so each channel is shifted by its mean.
+    # NaN is replaced by zero, the windows containing NaN have to be masked afterwards.
+    x = _channels(data)
+    nan = np.isnan(x)
+    if nan.any():
+        centered = np.where(nan, 0.0, x)
+        offset = centered.sum(axis=1) / np.maximum((~nan).sum(axis=1), 1)
+        centered -= offset[:, None]
+        centered[nan] = 0.0
+    else:
+        offset = x.mean(axis=1) if x.shape[1] else np.zeros(x.shape[0])
+        centered = x - offset[:, None]
+    return x, centered, offset
+
+
+def window_mean(data: np.ndarray, window: int) -> np.ndarray:
+    """The mean of each window."""
+    x, centered, offset = _centered(data)
+    if window > x.shape[1]:
+        return _empty(x).T
+    out = _window_sums(centered, window)
+    out /= window
+    out += offset[:, None]
+    return _mask_nan_windows(out, x, window).T
+
+
+def _constant_windows(x: np.ndarray, window: int) -> np.ndarray:
+    # Whether all values of each complete window are equal, the rows of `x` are channels
+    k, n = x.shape
+    changes = np.zeros((k, n), dtype=np.int32 if n < 2**31 else np.int64)
+    np.cumsum(x[:, 1:] != x[:, :-1], axis=1, out=changes[:, 1:])
+    return changes[:, window - 1 :] == changes[:, : n - window + 1]
+
+
+def _local_var(x: np.ndarray, window: int, ddof: int) -> np.ndarray:
+    # The variance of the windows of the channels `x`, in which NaN counts as zero, the first `window - 1` rows are NaN.
+    # The rows are split into blocks of `window` rows. A window ending in block `b` is the suffix of block `b - 1`
+    # and the prefix of block `b`, so its sums are the sum of a running sum from the end of block `b - 1` backwards
+    # and a running sum from the start of block `b`, both of which only contain rows of the window.
+    # Both blocks are centered by the first row of block `b`, which is part of all these windows,
+    # so the centered values are bounded by the range of the window and a level shift elsewhere doesn't cancel.
+    k, n = x.shape
+    blocks = -(-n // window)
+    # Row `j` of block `b` of each channel is at `[j, b]`, the running sums add whole rows of blocks
+    padded = np.zeros((k, window, blocks + 1))
+    rows = padded.transpose(0, 2, 1)
+    full = n // window
+    rows[:, 1 : full + 1] = x[:, : full * window].reshape(k, full, window)
+    if full < blocks:
+        rows[:, blocks, : n - full * window] = x[:, full * window :]
+    padded[np.isnan(padded)] = 0.0
+    reference = padded[:, :1, 1:].copy()
+    previous = padded[:, :, :-1] - reference
+    current = padded[:, :, 1:]
+    current -= reference
+    # The sums of the squares first, the running sums of the values overwrite them
+    moments = []
+    for sums, suffix in [
+        (np.square(current), np.square(previous)),
+        (current, previous),
+    ]:
+        if window <= _SHIFTED_EXTREMUM_MAX_WINDOW:
+            # Adding whole rows beats the strided accumulation of numpy for short windows
+            for j in range(1, window):
+                sums[:, j] += sums[:, j - 1]
+            for j in range(window - 2, 0, -1):
+                suffix[:, j] += suffix[:, j + 1]
+        else:
+            np.cumsum(sums, axis=1, out=sums)
+            np.cumsum(suffix[:, :0:-1], axis=1, out=suffix[:, :0:-1])
+        sums[:, : window - 1] += suffix[:, 1:]
+        moments.append(sums)
+    squares, sums = moments
+    sums **= 2
+    sums /= window
+    squares -= sums
+    squares /= window - ddof
+    out = np.ascontiguousarray(squares.transpose(0, 2, 1)).reshape(k, -1)[:, :n]
+    out[:, : window - 1] = np.nan
+    return out
+
+
+def window_var(data: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """The variance of each window with `window - ddof` degrees of freedom."""
+    x = _channels(data)
+    if window > x.shape[1] or window <= ddof:
+        return _empty(x).T
+    out = _local_var(x, window, ddof)
+    # Rounding can make a window slightly negative, constant windows are exactly zero like in pandas
+    np.maximum(out, 0.0, out=out, where=~np.isnan(out))
+    out[:, window - 1 :][_constant_windows(x, window)] = 0.0
+    return _mask_nan_windows(out, x, window).T
+
+
+def window_std(data: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """The standard deviation of each window with `window - ddof` degrees of freedom."""
+    return np.sqrt(window_var(data, window, ddof))
+
+
+def window_quantile(data: np.ndarray, window: int, q: float) -> np.ndarray:
+    """The `q`-quantile of each window with linear interpolation between the closest ranks."""
+    x = _channels(data)
+    k, n = x.shape
+    out = _empty(x)
+    if window > n:
+        return out.T
+    if window > _PARTITION_QUANTILE_MAX_WINDOW:
+        rolling = pd.DataFrame(x.T, copy=False).rolling(window)
+        return np.asfortranarray(rolling.quantile(q).to_numpy())
+    # `np.quantile` propagates the NaN of a window
+    windows = sliding_window_view(x, window, axis=1)
+    rows = max(_QUANTILE_CHUNK_ELEMENTS // (window * max(k, 1)), 1)
+    for start in range(0, n - window + 1, rows):
+        chunk = windows[:, start : start + rows]
+        out[:, window - 1 + start : window - 1 + start + chunk.shape[1]] = np.quantile(
+            chunk, q, axis=-1
+        )
+    return out.T
+
+
+def window_median(data: np.ndarray, window: int) -> np.ndarray:
+    """The median of each window."""
+    return window_quantile(data, window, 0.5)
+
+
+def _rolling_stage(window: int, statistic):
+    # A stage replacing the data columns by `statistic(data, window)`,
+    # which carries the last `window - 1` rows from one chunk to the next when streamed
+    assert window > 0
+
+    def _stream():
+        tail = None
+
+        def _rolling_chunk(ts: Timeseries):
+            nonlocal tail
+            data = ts.data_array()
+            block = data if tail is None else np.concatenate([tail, data])
+            ts.set_data(statistic(block, window)[len(block) - len(data) :])
+            tail = block[max(len(block) - (window - 1), 0) :].copy()
+            return ts
+
+        return _rolling_chunk
+
+    @streamable(_stream)
+    def _rolling(ts: Timeseries):
+        ts.set_data(statistic(ts.data_array(), window))
+        return ts
+
+    _rolling.__name__ = f"rolling_{statistic.__name__.removeprefix('window_')}"
+    return _rolling
+
+
+def rolling_min(window: int):
+    """Replaces each data point by the minimum of the last `window` data points, see :func:`window_min`."""
+    return _rolling_stage(window, window_min)
+
+
+def rolling_max(window: int):
+    """Replaces each data point by the maximum of the last `window` data points, see :func:`window_max`."""
+    return _rolling_stage(window, window_max)
+
+
+def rolling_mean(window: int):
+    """Replaces each data point by the mean of the last `window` data points, see :func:`window_mean`."""
+    return _rolling_stage(window, window_mean)
+
+
+def rolling_var(window: int, ddof: int = 1):
+    """Replaces each data point by the variance of the last `window` data points, see :func:`window_var`."""
+
+    def window_var_ddof(data, window):
+        return window_var(data, window, ddof)
+
+    window_var_ddof.__name__ = "var"
+    return _rolling_stage(window, window_var_ddof)
+
+
+def rolling_std(window: int, ddof: int = 1):
+    """Replaces each data point by the standard deviation of the last `window` data points, see :func:`window_std`."""
+
+    def window_std_ddof(data, window):
+        return window_std(data, window, ddof)
+
+    window_std_ddof.__name__ = "std"
+    return _rolling_stage(window, window_std_ddof)
+
+
+def rolling_median(window: int):
+    """Replaces each data point by the median of the last `window` data points, see :func:`window_median`."""
+    return _rolling_stage(window, window_median)
+
+
+def rolling_quantile(window: int, q: float):
+    """Replaces each data point by the `q`-quantile of the last `window` data points, see :func:`window_quantile`."""
+    assert 0.0 <= q <= 1.0
+
+    def window_q(data, window):
+        return window_quantile(data, window, q)
+
+    window_q.__name__ = "quantile"
+    return _rolling_stage(window, window_q)
@@ -0,0 +1,111 @@
+"""
+Segmentation of a series into fixed length windows for feature extraction.
+The windows are strided views of the data, cutting millions of windows allocates nothing per window,
+and the reductions of :class:`Segments` reduce all windows of all channels at once.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+PADDINGS = ("none", "nan", "zero", "edge")
+FEATURES = ("mean", "energy", "min", "max", "slope")
+
+
+class Segments:
+    """Windows of `length` rows starting every `stride` rows of a 2-D block with one column per channel.
+
+    Parameters
+    ----------
+    data
+        2-D array with one row per data point and one column per channel.
+    length
+        The number of rows of each window.
+    stride
+        The number of rows between the starts of two windows. Defaults to `length`, i.e. windows without overlap.
+    padding
+        What to do with the last rows, which don't fill a whole window:
+        `"none"` drops them, `"nan"`, `"zero"` or `"edge"` (the last row) pad the last windows.
+        Padding copies the data once, otherwise the windows are views of `data`.
+    """
+
+    def __init__(self, data, length: int, stride: int | None = None, padding="none"):
+        if padding not in PADDINGS:
+            raise ValueError(
+                f"Argument `padding` should be one of {PADDINGS}, but is '{padding}'."
+            )
+        stride = length if stride is None else stride
+        assert length > 0 and stride > 0
+        data = np.asarray(data, dtype=np.float64)
+        assert data.ndim == 2, "expected one column per channel"
+        n = len(data)
+        if n == 0 or (padding == "none" and n < length):
+            count = 0
+        elif padding == "none":
+            count = (n - length) // stride + 1
+        else:
+            # Enough windows to cover the last row, but every window starts within the data
+            count = min(-(-max(n - length, 0) // stride) + 1, (n - 1) // stride + 1)
+        rows = (count - 1) * stride + length if count > 0 else 0
+        if rows > n:
+            padded = np.empty((rows, data.shape[1]), order="F")
+            padded[:n] = data
+            padded[n:] = {"nan": np.nan, "zero": 0.0}.get(padding, data[-1:])
+            data = padded
+        self.length = length
+        self.stride = stride
+        if count == 0:
+            self.windows = np.empty((0, length, data.shape[1]))
+        else:
+            # Shape (windows, length, channels)
+            windows = sliding_window_view(data, length, axis=0)[::stride]
+            self.windows = windows.transpose(0, 2, 1)[:count]
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def starts(self) -> np.ndarray:
+        """The position of the first row of each window."""
+        return np.arange(len(self)) * self.stride
+
+    def mean(self) -> np.ndarray:
+        """The mean of each window, one row per window and one column per channel."""
+        return np.einsum("wlc->wc", self.windows) / self.length
+
+    def energy(self) -> np.ndarray:
+        """The sum of the squares of each window."""
+        return np.einsum("wlc,wlc->wc", self.windows, self.windows)
+
+    def min(self) -> np.ndarray:
+        """The minimum of each window."""
+        return self.windows.min(axis=1)
+
+    def max(self) -> np.ndarray:
+        """The maximum of each window."""
+        return self.windows.max(axis=1)
+
+    def slope(self) -> np.ndarray:
+        """The slope of the least squares line through each window per row.
+        Divide by the sampling interval for the slope per time unit.
+        """
+        positions = np.arange(self.length) - (self.length - 1) / 2.0
+        squares = positions @ positions
+        if squares == 0.0:
+            return np.zeros((len(self), self.windows.shape[2]))
+        return np.einsum("wlc,l->wc", self.windows, positions) / squares
+
+    def features(self, names=FEATURES) -> np.ndarray:
+        """The features `names` of each window side by side,
+        one row per window and the channels of the first feature, then those of the second and so on.
+        """
+        for name in names:
+            if name not in FEATURES:
+                raise ValueError(
+                    f"Features should be some of {FEATURES}, but '{name}' isn't."
+                )
+        out = np.empty((len(self), len(names) * self.windows.shape[2]), order="F")
+        channels = self.windows.shape[2]
+        for i, name in enumerate(names):
+            out[:, i * channels : (i + 1) * channels] = getattr(self, name)()
+        return out
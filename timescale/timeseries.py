@@ -12,6 +12,26 @@ DEFAULT_TIME_COLUMN = "time"
 
 
 class Timeseries:
+    # A `Timeseries` is either backed by a `DataFrame` (`_frame`)
+    # or by a 1-D time array and a contiguous 2-D float array with one column per channel.
+    # The `DataFrame` of an array backed `Timeseries` is only built when `df` is accessed.
+    __slots__ = (
+        "_time_column",
+        "_validated",
+        "_frame",
+        "_time",
+        "_data",
+        "_columns",
+        "_dtypes",
+        "_time_position",
+        # A `pd.Index`, `None` for a range index, or the values of an appended index, see `index`
+        "_index",
+        # Buffers with spare rows behind `_time`, `_data` and the values of `_index`, see `append`
+        "_time_buffer",
+        "_data_buffer",
+        "_index_buffer",
+    )
+
     def __init__(self, df, time_column: str | int = DEFAULT_TIME_COLUMN):
         """
         Creates a new ``Timeseries`` object.
@@ -51,18 +71,359 @@ class Timeseries:
                                   but is of type {type(time_column)}."
                 )
             self._time_column = time_column
+        self._validated = None
         self.df = df
 
+    @classmethod
+    def from_arrays(
+        cls,
+        time,
+        data,
+        columns=None,
+        time_column: str = DEFAULT_TIME_COLUMN,
+        index=None,
+    ) -> "Timeseries":
+        """
+        Creates a new ``Timeseries`` object directly from NumPy arrays without building a `DataFrame`.
+        The arrays are not validated.
+
+        Parameters
+        ----------
+        time
+            1-D array with the values of the time column.
+        data
+            1-D array for a single channel or 2-D array with one column per channel.
+        columns
+            The names of the data columns. Defaults to `value-0`, `value-1`, ...
+        time_column
+            The name of the time column.
+        index
+            The index of the `DataFrame` view. Defaults to a :class:`pandas.RangeIndex`.
+        """
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        if columns is None:
+            columns = [f"value-{i}" for i in range(data.shape[1])]
+        ts = cls.__new__(cls)
+        ts._time_column = time_column
+        ts._validated = None
+        ts._frame = None
+        ts._columns = list(columns)
+        ts._time_position = 0
+        ts._index = None if index is None else pd.Index(index)
+        ts._time = np.asarray(time)
+        ts._dtypes = [data.dtype] * data.shape[1]
+        ts._data = np.asfortranarray(data, dtype=np.float64)
+        assert (
+            len(ts._columns) == ts._data.shape[1]
+        ), "one name per data column expected"
+        assert len(ts._time) == len(ts._data), "time and data have different lengths"
+        return ts
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """
+        The `DataFrame` view of the `Timeseries`.
+        Accessing it builds the `DataFrame` if the `Timeseries` is array backed.
+        Afterwards the `Timeseries` is backed by this `DataFrame`, so it can be modified in place,
+        unless its columns are read-only views, e.g. from :func:`timescale.io.ts_from_arrow_table` with `zero_copy`.
+        """
+        if self._frame is None:
+            self._frame = self._build_frame()
+            self._time = self._data = None
+        return self._frame
+
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        self._frame = df
+        self._time = self._data = None
+        self.invalidate()
+
+    def is_array_backed(self) -> bool:
+        return self._frame is None
+
+    def invalidate(self):
+        """
+        Forgets the cached validation state of the `Timeseries`.
+        This happens automatically when `df` is replaced or the time column is set through :func:`Timeseries.set_time()`.
+        Call it yourself after modifying the time column of `df` in place.
+        """
+        self._validated = None
+
+    def set_time(self, values):
+        """
+        Replaces the values of the time column and invalidates the cached validation state.
+
+        Parameters
+        ----------
+        values
+            The new time values. Has to have the same length as the `Timeseries`.
+        """
+        if self._frame is None:
+            values = np.asarray(values)
+            assert len(values) == len(self._time), "time has a different length"
+            self._time = values
+        else:
+            self._frame[self._time_column] = values
+        self.invalidate()
+
+    def set_data(self, data, dtypes=None):
+        """
+        Replaces the data columns with the columns of a 2-D array of the same length.
+        The `Timeseries` is array backed afterwards.
+
+        Parameters
+        ----------
+        data
+            2-D array with one column per data column.
+            It is not copied if it already is a Fortran ordered float array, so it should not be modified afterwards.
+        dtypes
+            The dtypes of the data columns in the `DataFrame` view. Defaults to float.
+        """
+        data = np.asfortranarray(data, dtype=np.float64)
+        assert data.ndim == 2 and data.shape[1] == len(
+            self.data_columns()
+        ), "one column per data column expected"
+        self._to_arrays(keep_data=False)
+        assert len(data) == len(self._time), "data has a different length"
+        self._data = data
+        self._dtypes = (
+            [np.dtype(np.float64)] * data.shape[1] if dtypes is None else list(dtypes)
+        )
+
+    def set_arrays(self, time, data, index=None, dtypes=None):
+        """
+        Replaces the time column and the data columns at once. Their length may change.
+        The `Timeseries` is array backed afterwards.
+
+        Parameters
+        ----------
+        time
+            1-D array of the new time values.
+        data
+            2-D array with one column per data column.
+        index
+            The new index. Defaults to a :class:`pandas.RangeIndex`.
+        dtypes
+            The dtypes of the data columns in the `DataFrame` view. Defaults to float.
+        """
+        self._to_arrays(keep_data=False)
+        self._time = np.asarray(time)
+        self._index = None if index is None else pd.Index(index)
+        self._data = None
+        self.set_data(data, dtypes)
+        self.invalidate()
+
+    def append(self, time, data, index=None):
+        """
+        Appends rows to the end of the `Timeseries`. The `Timeseries` is array backed afterwards.
+        The rows and the values of their index are written into buffers, which grow geometrically,
+        so appending costs O(new rows) amortized instead of O(all rows).
+        Arrays returned before by :func:`Timeseries.time_array()` or :func:`Timeseries.data_array()`
+        and shallow copies keep their rows.
+        The buffers hold floats, so all data columns are float in the `DataFrame` view afterwards,
+        e.g. an appended 1.7 isn't truncated in a column, which was integer before.
+
+        Parameters
+        ----------
+        time
+            1-D array of the time values of the new rows.
+        data
+            2-D array with one column per data column, or 1-D for a single data column.
+        index
+            The index of the new rows. Required if the `Timeseries` doesn't have a :class:`pandas.RangeIndex`.
+        """
+        time = np.asarray(time)
+        if len(time) == 0:
+            return
+        data = np.asarray(data, dtype=np.float64).reshape(len(time), -1)
+        self._to_arrays()
+        n, m = len(self._time), len(time)
+        assert (
+            data.shape[1] == self._data.shape[1]
+        ), "one column per data column expected"
+        if index is not None:
+            values = np.asarray(index)
+            if values.dtype.kind not in "biufmM":
+                # Strings, timestamps and the like become the values of a `pd.Index`
+                values = pd.Index(index).to_numpy()
+            self._append_index(n, values)
+        else:
+            assert self._index is None or (
+                isinstance(self._index, pd.RangeIndex)
+                and self._index.equals(pd.RangeIndex(n))
+            ), "the index of the new rows is required"
+            self._index = None
+        # The buffers are only reused, if the arrays are still views of them
+        buffered = (
+            getattr(self, "_time_buffer", None) is not None
+            and self._time.base is self._time_buffer
+            and self._data.base is self._data_buffer
+            and self._time_buffer.dtype == np.result_type(self._time, time)
+        )
+        if not buffered or n + m > len(self._time_buffer):
+            capacity = max(2 * (n + m), 16)
+            dtype = np.result_type(self._time, time)
+            self._time_buffer = np.empty(capacity, dtype=dtype)
+            self._time_buffer[:n] = self._time
+            self._data_buffer = np.empty((capacity, data.shape[1]), order="F")
+            self._data_buffer[:n] = self._data
+        self._time_buffer[n : n + m] = time
+        self._data_buffer[n : n + m] = data
+        self._time = self._time_buffer[: n + m]
+        self._data = self._data_buffer[: n + m]
+        self._dtypes = [np.dtype(np.float64)] * data.shape[1]
+        self.invalidate()
+
+    def _append_index(self, n: int, values: np.ndarray):
+        # Writes the index values of appended rows into a buffer like `append` does with the time,
+        # the `pd.Index` is only built when it is used
+        old = self._index
+        if isinstance(old, pd.Index) and not isinstance(old, pd.RangeIndex):
+            old = old.to_numpy()
+        buffered = (
+            isinstance(old, np.ndarray)
+            and getattr(self, "_index_buffer", None) is not None
+            and old.base is self._index_buffer
+            and self._index_buffer.dtype == np.result_type(old, values)
+        )
+        if not buffered or n + len(values) > len(self._index_buffer):
+            old = self.index.to_numpy()
+            self._index_buffer = np.empty(
+                max(2 * (n + len(values)), 16), dtype=np.result_type(old, values)
+            )
+            self._index_buffer[:n] = old
+        self._index_buffer[n : n + len(values)] = values
+        self._index = self._index_buffer[: n + len(values)]
+
+    def time_array(self) -> np.ndarray:
+        """Returns the values of the time column. The array should not be modified."""
+        if self._frame is None:
+            return self._time
+        return self._frame[self._time_column].to_numpy()
+
+    def data_array(self) -> np.ndarray:
+        """
+        Returns the data columns as 2-D float array with one column per channel.
+        The array should not be modified.
+        A `DataFrame` backed `Timeseries` returns a new array, which is owned by the caller.
+        """
+        if self._frame is None:
+            return self._data
+        frame = self._frame
+        positions = [i for i, c in enumerate(frame.columns) if c != self._time_column]
+        data = np.empty((len(frame), len(positions)), order="F")
+        for j, i in enumerate(positions):
+            data[:, j] = frame.iloc[:, i].to_numpy(dtype=np.float64)
+        return data
+
+    def data_columns(self) -> list:
+        if self._frame is None:
+            return self._columns
+        return [c for c in self._frame.columns if c != self._time_column]
+
+    def data_dtypes(self) -> list:
+        if self._frame is None:
+            return self._dtypes
+        # Selecting the data columns would copy them
+        frame = self._frame
+        return [
+            dtype
+            for c, dtype in zip(frame.columns, frame.dtypes)
+            if c != self._time_column
+        ]
+
+    @property
+    def index(self) -> pd.Index:
+        if self._frame is None:
+            if self._index is None:
+                return pd.RangeIndex(len(self._time))
+            if isinstance(self._index, np.ndarray):
+                self._index = pd.Index(self._index, copy=False)
+            return self._index
+        return self._frame.index
+
+    def __len__(self) -> int:
+        if self._frame is None:
+            return len(self._time)
+        return len(self._frame)
+
+    def _frame_data(self) -> pd.DataFrame:
+        return self._frame.loc[:, self._frame.columns != self._time_column]
+
+    def _to_arrays(self, keep_data=True):
+        # Switches to the array representation, keeping the column order and the index of the frame.
+        # The data array is only extracted from the frame if `keep_data` is set, it is a copy.
+        if self._frame is None:
+            return
+        frame = self._frame
+        columns = list(frame.columns)
+        self._time_position = columns.index(self._time_column)
+        self._columns = [c for c in columns if c != self._time_column]
+        self._dtypes = self.data_dtypes()
+        self._data = self.data_array() if keep_data else None
+        self._time = self.time_array()
+        self._index = frame.index
+        self._frame = None
+
+    def _build_frame(self, with_time=True) -> pd.DataFrame:
+        columns = {
+            c: self._data[:, i].astype(dtype)
+            for i, (c, dtype) in enumerate(zip(self._columns, self._dtypes))
+        }
+        if with_time:
+            items = list(columns.items())
+            items.insert(self._time_position, (self._time_column, self._time.copy()))
+            columns = dict(items)
+        return pd.DataFrame(columns, index=self.index, copy=False)
+
+    def _buffers(self) -> list:
+        # The arrays holding the values of the `Timeseries`
+        if self._frame is None:
+            return [self._time, self._data]
+        return [self._frame.iloc[:, i].to_numpy() for i in range(self._frame.shape[1])]
+
+    def copy(self, deep=True) -> "Timeseries":
+        """
+        Returns a copy of the `Timeseries`.
+
+        Parameters
+        ----------
+        deep
+            If `False`, the copy shares its buffers with this `Timeseries`.
+            Replacing columns of the copy does not affect the original,
+            writing into the shared buffers does (unless pandas copy-on-write is enabled).
+        """
+        ts = Timeseries.__new__(Timeseries)
+        for slot in Timeseries.__slots__:
+            setattr(ts, slot, getattr(self, slot, None))
+        if ts._frame is not None:
+            ts._frame = ts._frame.copy(deep=deep)
+        elif deep:
+            ts._time = ts._time.copy()
+            ts._data = ts._data.copy(order="F")
+        # Appending to the copy must not write into the buffers of this `Timeseries`
+        ts._time_buffer = ts._data_buffer = ts._index_buffer = None
+        if ts._columns is not None:
+            ts._columns = list(ts._columns)
+            ts._dtypes = list(ts._dtypes)
+        return ts
+
     def __repr__(self) -> str:
-        return f"timecolumn: {self._time_column} \n" + self.df.__repr__()
+        frame = self._frame if self._frame is not None else self._build_frame()
+        return f"timecolumn: {self._time_column} \n" + frame.__repr__()
 
     def validate(self):
         """
         Valides the `Timeseries`. If the `Timeseries` is not valid, a exception is raised accordingly.
         A valid `Timeseries` does contain a valid "time" column in the `DataFrame`.
-        A valid time column has elements of a sub class from :class:`np.integer` or :class:`float`
+        A valid time column has elements of a sub class from :class:`np.integer`, :class:`float` or :class:`np.datetime64`
         and is strictly sorted in ascending order.
         Raises an corresponding exception if the `Timeseries` is not valid.
+        A successful validation is cached for the current time column, so repeated calls are cheap.
+        Replacing `df` or the time column revalidates, writing single values of the time column in place
+        requires :func:`Timeseries.invalidate()`.
 
         Exceptions
         ----------
@@ -77,24 +438,33 @@ class Timeseries:
         """
         # Check if time_column does exist in data frame.
         # It may be removed after creation
-        if self._time_column not in self.df.columns:
+        if self._frame is not None and self._time_column not in self._frame.columns:
             raise IndexError(
                 f"Validation failed. Column '{self._time_column}' not found in `self.df`.",
             )
-        time_type = self.df.dtypes[self._time_column]
+        time_values = self.time_array()
+        # The cache is bound to the memory of the time column, which changes when the column is replaced
+        key = (
+            self._time_column,
+            time_values.__array_interface__["data"][0],
+            len(time_values),
+        )
+        if self._validated == key:
+            return
 
         # Check if the time column contains a valid datatype.
-        if not np.issubdtype(time_type, np.integer) and not np.issubdtype(
-            time_type, float
+        # Datetimes are compared by their integer representation.
+        if np.issubdtype(time_values.dtype, np.datetime64):
+            time_values = time_values.view(np.int64)
+        elif not np.issubdtype(time_values.dtype, np.integer) and not np.issubdtype(
+            time_values.dtype, float
         ):
             raise AttributeError(
-                "Invalid type of column referenced by `time_column`. Should be of type :class:`np.integer` or :class:`float`."
+                "Invalid type of column referenced by `time_column`. Should be of type :class:`np.integer`, :class:`float` or :class:`np.datetime64`."
             )
-        time_values = self.df[self._time_column]
-        if any(
-            time_values[i] >= time_values[i + 1] for i in range(len(time_values) - 1)
-        ):
+        if np.any(time_values[:-1] >= time_values[1:]):
             raise AssertionError("time column has to be strictly ordered.")
+        self._validated = key
 
     def is_valid(self, debug=False) -> bool:
         """
@@ -115,7 +485,11 @@ class Timeseries:
             return False
 
     def data_df(self) -> pd.DataFrame:
-        return self.df.loc[:, self.df.columns != self._time_column]
+        if self._frame is None:
+            return self._build_frame(with_time=False)
+        return self._frame_data()
 
     def time_column(self) -> pd.Series:
-        return pd.Series(self.df[self._time_column])
+        if self._frame is None:
+            return pd.Series(self._time, index=self.index, name=self._time_column)
+        return pd.Series(self._frame[self._time_column])